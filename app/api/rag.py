@@ -1,14 +1,14 @@
 """FastAPI endpoints for RAG ingestion and deletion (ragprep-compatible)."""
 from __future__ import annotations
 
-import json
 import logging
 import time
 import uuid
 from dataclasses import asdict
 from functools import lru_cache
-from typing import Any, Dict, List, Mapping, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select, text
 
@@ -313,16 +313,31 @@ def get_rag_chunks_repository() -> RagChunksRepository:
     return _get_rag_chunks_repository()
 
 
+def _iter_jsonl_lines(content: str) -> Iterator[tuple[int, str]]:
+    """Yield (line_no, line) for non-empty, non-comment JSONL lines.
+
+    Lines are sliced one at a time at newline offsets, so the body is never
+    copied or split into a full list up front.
+    """
+
+    pos, line_no, end = 0, 0, len(content)
+    while pos < end:
+        newline = content.find("\n", pos)
+        if newline == -1:
+            newline = end
+        line_no += 1
+        line = content[pos:newline].strip()
+        pos = newline + 1
+        if line and not line.startswith("#"):
+            yield line_no, line
+
+
 def _parse_jsonl_chunks(content: str) -> List[ChunkRecord]:
-    lines = content.strip().split("\n")
     chunks: List[ChunkRecord] = []
 
-    for line_no, line in enumerate(lines, start=1):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
+    for line_no, line in _iter_jsonl_lines(content):
         try:
-            chunk_dict = json.loads(line)
+            chunk_dict = orjson.loads(line)
             chunk = ChunkRecord.from_dict(chunk_dict)
             chunks.append(chunk)
         except Exception as exc:
@@ -333,6 +348,47 @@ def _parse_jsonl_chunks(content: str) -> List[ChunkRecord]:
     return chunks
 
 
+async def _iter_jsonl_stream(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield (line_no, line) from a streamed JSONL body, holding at most one partial line."""
+
+    buffer = bytearray()
+    line_no = 0
+
+    def _complete_lines() -> Iterator[tuple[int, bytes]]:
+        nonlocal line_no
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line_no += 1
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if line and not line.startswith(b"#"):
+                yield line_no, line
+        del buffer[:start]
+
+    async for piece in body:
+        buffer += piece
+        for item in _complete_lines():
+            yield item
+    buffer += b"\n"
+    for item in _complete_lines():
+        yield item
+
+
+# Chunks buffered per rag_chunks upsert when storing a streamed JSONL body.
+_STREAM_WINDOW_CHUNKS = 512
+
+
+async def _stream_chunk_records(body: AsyncIterator[bytes]) -> AsyncIterator[ChunkRecord]:
+    async for line_no, line in _iter_jsonl_stream(body):
+        try:
+            yield ChunkRecord.from_dict(orjson.loads(line))
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid JSONL at line {line_no}: {exc}",
+            ) from exc
+
+
 @router.post(
     "/store-chunks",
     response_model=StoreChunksResponse,
@@ -465,18 +521,14 @@ def _validate_embed_chunks_request(request: EmbedChunksRequest) -> None:
             )
 
 
-def _reject_hf_batch_ingest(request: EmbedChunksRequest) -> None:
-    """Block large/batch ingest while query embeddings use Hugging Face."""
+def _reject_hf_ingest(route: str) -> None:
+    """Block ingest on ``route`` while query embeddings use Hugging Face."""
     provider = (settings.embeddings_provider or "http").strip().lower()
-    if (
-        provider in {"huggingface", "hf"}
-        and settings.embeddings_hf_forbid_ingest
-        and not request.cleanup_only
-    ):
+    if provider in {"huggingface", "hf"} and settings.embeddings_hf_forbid_ingest:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=(
-                "Batch ingest via /rag/embed-chunks is blocked while "
+                f"Batch ingest via {route} is blocked while "
                 "RAGRUN_EMBEDDINGS_PROVIDER=huggingface "
                 "(avoids burning HF credits on large embeds). "
                 "Run ingest locally: set RAGRUN_EMBEDDINGS_PROVIDER=http and "
@@ -487,6 +539,12 @@ def _reject_hf_batch_ingest(request: EmbedChunksRequest) -> None:
         )
 
 
+def _reject_hf_batch_ingest(request: EmbedChunksRequest) -> None:
+    """Block large/batch ingest while query embeddings use Hugging Face."""
+    if not request.cleanup_only:
+        _reject_hf_ingest("/rag/embed-chunks")
+
+
 def _chunks_text_kb(chunks: List[ChunkRecord]) -> float:
     return sum(len(c.text.encode("utf-8")) for c in chunks) / 1024.0
 
@@ -635,6 +693,68 @@ async def embed_chunks(
     return UploadChunksResponse(**asdict(result), text_kb=text_kb)
 
 
+@router.post(
+    "/upload-chunks-stream",
+    response_model=UploadChunksResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def upload_chunks_stream(
+    request: Request,
+    collection_name: str = Query(..., description="Target Qdrant collection name (= rag_partition)"),
+    default_scope: Optional[str] = Query(None, description="Scope for chunks without metadata.scope"),
+    batch_size: Optional[int] = Query(None, ge=1, le=512, description="Embedding batch size"),
+    embedding_model: Optional[str] = Query(None, description="Optional embedding model override"),
+    skip_cleanup: bool = Query(False, description="Do not delete stale chunk_ids after the embed run"),
+    prefix_passage: Optional[str] = Query(None, description="Passage prefix prepended before embedding"),
+    service: IngestionService = Depends(get_ingestion_service),
+) -> UploadChunksResponse:
+    """Store a raw JSONL request body in rag_chunks as it streams in, then embed it.
+
+    Lines are upserted in _STREAM_WINDOW_CHUNKS windows, so parsing holds one window
+    instead of the whole body. Embedding then runs the /embed-chunks path for the
+    streamed source_ids: rag_chunks stays the source of truth, and stale cleanup uses
+    its active ids, not just the ids in this body. A malformed line aborts with 400
+    before anything is embedded; windows before it are already stored.
+    """
+
+    _reject_hf_ingest("/rag/upload-chunks-stream")
+    if collection_name == RAG_PARTITION_SHARED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Store {RAG_PARTITION_SHARED} chunks via /rag/store-chunks",
+        )
+
+    rag_repo = get_rag_chunks_repository()
+    source_ids: set[str] = set()
+    window: List[ChunkRecord] = []
+    async for chunk in _stream_chunk_records(request.stream()):
+        source_ids.add(chunk.metadata.source_id)
+        window.append(chunk)
+        if len(window) >= _STREAM_WINDOW_CHUNKS:
+            await rag_repo.upsert_chunks(collection_name, window, default_scope=default_scope)
+            window = []
+    if window:
+        await rag_repo.upsert_chunks(collection_name, window, default_scope=default_scope)
+    if not source_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid chunks found in JSONL content",
+        )
+
+    return await embed_chunks(
+        EmbedChunksRequest(
+            collection_name=collection_name,
+            batch_size=batch_size,
+            embedding_model=embedding_model,
+            skip_cleanup=skip_cleanup,
+            shared_source_ids=[],
+            source_ids=sorted(source_ids),
+            prefix_passage=prefix_passage,
+        ),
+        service,
+    )
+
+
 def _qdrant_filter_for_source(source_id: str) -> dict[str, object]:
     return {"must": [{"key": "source_id", "match": {"value": source_id}}]}
 
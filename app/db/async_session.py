@@ -6,9 +6,12 @@ from functools import lru_cache
 from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
+from .session import _SUPABASE_CONNECT_ARGS
+
 
 def _as_async_url(dsn: str) -> str | URL:
     """Convert a sync psycopg DSN to its async variant.
@@ -40,6 +43,22 @@ def get_async_engine() -> AsyncEngine:
     )
 
 
+def create_standalone_async_engine() -> AsyncEngine:
+    """Return a new, uncached async engine for one-off commands.
+
+    Uses the sync engine's NullPool and Supabase connect args (connect and
+    statement timeouts, no prepared statements). The caller owns it and must
+    dispose it; the shared get_async_engine() pool is left untouched.
+    """
+
+    return create_async_engine(
+        _as_async_url(str(settings.postgres_dsn)),
+        future=True,
+        poolclass=NullPool,
+        connect_args=_SUPABASE_CONNECT_ARGS,
+    )
+
+
 @lru_cache(maxsize=1)
 def get_async_sessionmaker() -> sessionmaker[AsyncSession]:
     """Session factory for async DB work."""
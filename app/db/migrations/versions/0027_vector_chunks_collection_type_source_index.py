@@ -0,0 +1,31 @@
+"""Covering index on vector_chunks (collection, chunk_type, source_id).
+
+The chunks:info / chunks:delete CLI queries filter vector_chunks by collection
+(plus chunk_type / source_id) and read chunk_id, COUNT(*) and MIN/MAX(created_at).
+INCLUDE (chunk_id, created_at) lets Postgres answer them with index-only scans.
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0027"
+down_revision = "0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vector_chunks_coll_type_src
+            ON vector_chunks (collection, chunk_type, source_id)
+            INCLUDE (chunk_id, created_at)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_vector_chunks_coll_type_src")
@@ -45,6 +45,14 @@ vector_chunks_table = Table(
     Column("references", JSONType),
 )
 
+Index(
+    "idx_vector_chunks_coll_type_src",
+    vector_chunks_table.c.collection,
+    vector_chunks_table.c.chunk_type,
+    vector_chunks_table.c.source_id,
+    postgresql_include=["chunk_id", "created_at"],
+)
+
 # Primary chunk store (DB-first); embedded_at set after successful Qdrant/vector_chunks sync.
 rag_chunks_table = Table(
     "rag_chunks",
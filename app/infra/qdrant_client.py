@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Mapping, Sequence, Tuple
+from typing import AsyncIterator, Iterable, List, Mapping, Sequence, Tuple
 
 import httpx
 
@@ -323,7 +323,7 @@ class QdrantClient:
             next_offset = result.get("next_page_offset")
             return points, next_offset
 
-    async def scroll_all_points(
+    async def scroll_points_iter(
         self,
         collection: str,
         *,
@@ -332,14 +332,14 @@ class QdrantClient:
         with_payload: bool = True,
         with_vectors: bool = False,
         max_pages: int = 10_000,
-    ) -> List[Mapping[str, object]]:
-        """Scroll all matching points (handles pagination).
+    ) -> AsyncIterator[List[Mapping[str, object]]]:
+        """Yield matching points one page at a time (handles pagination).
 
-        This is intentionally conservative (max_pages) to avoid infinite loops if
-        a server returns a cyclic offset for some reason.
+        Only the current page is held in memory. This is intentionally
+        conservative (max_pages) to avoid infinite loops if a server returns a
+        cyclic offset for some reason.
         """
 
-        all_points: List[Mapping[str, object]] = []
         offset: object | None = None
         for _ in range(max_pages):
             points, offset = await self.scroll_points_page(
@@ -350,9 +350,33 @@ class QdrantClient:
                 with_payload=with_payload,
                 with_vectors=with_vectors,
             )
-            all_points.extend(points)
+            if points:
+                yield points
             if offset is None:
                 break
+
+    async def scroll_all_points(
+        self,
+        collection: str,
+        *,
+        filter_: Mapping[str, object] | None = None,
+        limit: int = 256,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+        max_pages: int = 10_000,
+    ) -> List[Mapping[str, object]]:
+        """Scroll all matching points into one list (see ``scroll_points_iter``)."""
+
+        all_points: List[Mapping[str, object]] = []
+        async for points in self.scroll_points_iter(
+            collection,
+            filter_=filter_,
+            limit=limit,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            max_pages=max_pages,
+        ):
+            all_points.extend(points)
         return all_points
 
     async def search_points(
@@ -99,12 +99,24 @@ class RagChunksRepository:
     ) -> None:
         """Insert or update chunks. Resets embedded_at when content_hash changes."""
 
-        chunk_list = list(chunks)
-        if not chunk_list:
+        # Keep the newest record per chunk_id before building rows so duplicates
+        # never pay for the metadata dump.
+        seen: dict[str, ChunkRecord] = {}
+        for chunk in chunks:
+            cid = chunk.metadata.chunk_id
+            existing = seen.get(cid)
+            if existing is None:
+                seen[cid] = chunk
+            else:
+                u_new = chunk.metadata.updated_at
+                u_old = existing.metadata.updated_at
+                if u_new is not None and (u_old is None or u_new > u_old):
+                    seen[cid] = chunk
+        if not seen:
             return
 
         rows: List[dict] = []
-        for chunk in chunk_list:
+        for chunk in seen.values():
             metadata = chunk.metadata
             scope = _scope_for_chunk(chunk, default_scope)
             rows.append(
@@ -126,19 +138,6 @@ class RagChunksRepository:
                 }
             )
 
-        seen: dict[str, dict] = {}
-        for row in rows:
-            cid = row["chunk_id"]
-            existing = seen.get(cid)
-            if existing is None:
-                seen[cid] = row
-            else:
-                u_new = row.get("updated_at")
-                u_old = existing.get("updated_at")
-                if u_new is not None and (u_old is None or u_new > u_old):
-                    seen[cid] = row
-        rows = list(seen.values())
-
         def _upsert_batch(connection, batch: List[dict]) -> None:
             if not batch:
                 return
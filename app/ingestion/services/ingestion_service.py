@@ -1,15 +1,17 @@
 """Core ingestion service used by Phase 3 endpoints."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID, uuid4, uuid5, NAMESPACE_DNS
 
 from app.shared.models import ChunkRecord
-from app.infra.embedding_client import EmbeddingClient
+from app.infra.embedding_client import EmbeddingBatchResult, EmbeddingClient
 from app.infra.qdrant_client import QdrantClient
 from app.infra.sparse_embedder import SparseEmbedder
 from app.ingestion.repositories import VectorChunksRepository
@@ -18,6 +20,19 @@ from app.core.telemetry import IngestionTelemetryClient
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1 << 18)
+def derive_point_id(chunk_id: str) -> str:
+    """Deterministic Qdrant point id for a chunk_id (uuid5 over NAMESPACE_DNS).
+
+    Every writer and deleter must derive ids through this function: existing
+    collections are keyed by these uuid5 values, so changing the scheme means
+    re-embedding. Re-ingest and delete runs map the same ids again; the LRU
+    skips the SHA-1.
+    """
+
+    return str(uuid5(NAMESPACE_DNS, chunk_id))
+
+
 @dataclass(slots=True)
 class UploadResult:
     """Structured response returned to the API layer."""
@@ -51,6 +66,8 @@ class IngestionService:
     _TAG_STRIP_RE = re.compile(r"</?\s*(q|i)\b[^>]*>", re.IGNORECASE)
     _SOFT_HYPHEN_RE = re.compile("\u00ad")
     _PARA_MARKER_RE = re.compile(r"(?m)^\d{1,4}\|\s?")
+    # Uploads larger than this default to bulk mode (unacknowledged upserts).
+    BULK_UPSERT_THRESHOLD = 1000
 
     @staticmethod
     def _qdrant_filter_for_source(source_id: str) -> dict[str, object]:
@@ -92,6 +109,7 @@ class IngestionService:
         telemetry_client: Optional[IngestionTelemetryClient] = None,
         sparse_embedder: Optional[SparseEmbedder] = None,
         default_batch_size: int = 64,
+        embed_concurrency: int = 4,
     ) -> None:
         self.embedding_client = embedding_client
         self.qdrant_client = qdrant_client
@@ -99,6 +117,7 @@ class IngestionService:
         self.telemetry_client = telemetry_client
         self.sparse_embedder = sparse_embedder
         self.default_batch_size = default_batch_size
+        self.embed_concurrency = max(embed_concurrency, 1)
 
     async def upload_chunks(
         self,
@@ -111,11 +130,16 @@ class IngestionService:
         cleanup_active_ids: Mapping[tuple[str, str], set[str]] | None = None,
         prefix_passage: str | None = None,
         shared_book_chunk_type_override: str | None = None,
+        bulk_mode: bool | None = None,
     ) -> UploadResult:
         """Validate, dedupe, embed, and upsert a batch of chunks.
 
         By default this performs a per-source_id cleanup of stale chunk_ids (sync-style).
         Set skip_cleanup=True when the caller will handle deletions explicitly (e.g. CLI sync).
+
+        In bulk mode (default: more than BULK_UPSERT_THRESHOLD chunks) Qdrant upserts are
+        sent with wait=false except the last one, which waits; Qdrant applies a collection's
+        updates in order, so the whole upload is applied when this returns.
         """
 
         if not chunks:
@@ -176,7 +200,7 @@ class IngestionService:
             embed_batch_size = batch_size or self.default_batch_size
             t0 = time.perf_counter()
             logger.info("upload_chunks: embedding %d texts (batch_size=%d)…", len(texts), embed_batch_size)
-            embedding_batch = await self.embedding_client.embed_texts(
+            embedding_batch = await self._embed_concurrently(
                 texts,
                 model_name=embedding_model,
                 batch_size=embed_batch_size,
@@ -211,9 +235,14 @@ class IngestionService:
             )
             t0 = time.perf_counter()
             logger.info("upload_chunks: upserting %d points to Qdrant…", len(points))
+            if bulk_mode is None:
+                bulk_mode = len(chunks) > self.BULK_UPSERT_THRESHOLD
+            last_start = ((len(points) - 1) // embed_batch_size) * embed_batch_size
             for i in range(0, len(points), embed_batch_size):
                 await self.qdrant_client.upsert_points(
-                    collection, points[i : i + embed_batch_size]
+                    collection,
+                    points[i : i + embed_batch_size],
+                    wait=not bulk_mode or i == last_start,
                 )
             logger.info("upload_chunks: upsert done in %.2fs", time.perf_counter() - t0)
 
@@ -233,7 +262,7 @@ class IngestionService:
                 payload["content_hash"] = chunk.metadata.content_hash
                 payload_updates.append(
                     {
-                        "id": str(uuid5(NAMESPACE_DNS, chunk.metadata.chunk_id)),
+                        "id": derive_point_id(chunk.metadata.chunk_id),
                         "payload": payload,
                     }
                 )
@@ -309,6 +338,58 @@ class IngestionService:
 
         return result
 
+    async def _embed_concurrently(
+        self,
+        texts: Sequence[str],
+        *,
+        model_name: str | None,
+        batch_size: int,
+    ) -> EmbeddingBatchResult:
+        """Embed ``batch_size`` windows with up to ``embed_concurrency`` requests in flight.
+
+        Texts are windowed in length order so each request pads to a similar
+        length; results are scattered back to input order. The Hugging Face
+        backend keeps a single call so its large-batch guard still sees the
+        full text count.
+        """
+
+        if getattr(self.embedding_client, "is_huggingface", False) or len(texts) <= batch_size:
+            return await self.embedding_client.embed_texts(
+                texts, model_name=model_name, batch_size=batch_size
+            )
+
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        by_length = [texts[idx] for idx in order]
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def _embed_window(start: int) -> EmbeddingBatchResult:
+            window = by_length[start : start + batch_size]
+            async with semaphore:
+                result = await self.embedding_client.embed_texts(
+                    window,
+                    model_name=model_name,
+                    batch_size=batch_size,
+                )
+            if len(result.embeddings) != len(window):
+                raise RuntimeError(
+                    "embedding count does not match window size "
+                    f"({len(result.embeddings)} != {len(window)})"
+                )
+            return result
+
+        results = await asyncio.gather(
+            *(_embed_window(start) for start in range(0, len(texts), batch_size))
+        )
+        embeddings: List[List[float]] = [[] for _ in texts]
+        sorted_vectors = (vector for result in results for vector in result.embeddings)
+        for idx, vector in zip(order, sorted_vectors, strict=True):
+            embeddings[idx] = vector
+        return EmbeddingBatchResult(
+            embeddings=embeddings,
+            dimensions=results[0].dimensions,
+            model_name=results[0].model_name,
+        )
+
     async def delete_chunks(
         self,
         *,
@@ -321,7 +402,7 @@ class IngestionService:
             raise ValueError("chunk_ids must not be empty")
 
         # Convert chunk IDs to UUIDs for Qdrant
-        point_uuids = [str(uuid5(NAMESPACE_DNS, cid)) for cid in chunk_ids]
+        point_uuids = [derive_point_id(cid) for cid in chunk_ids]
 
         await self.qdrant_client.delete_points(collection, point_uuids)
         # Best-effort: mirror cleanup should not block Qdrant deletion.
@@ -392,10 +473,9 @@ class IngestionService:
         if not chunks:
             return {}
 
-        ids = [uuid5(NAMESPACE_DNS, c.metadata.chunk_id) for c in chunks]
         points = await self.qdrant_client.retrieve_points(
             collection,
-            [str(pid) for pid in ids],
+            [derive_point_id(c.metadata.chunk_id) for c in chunks],
             with_vectors=False,
             with_payload=True,
         )
@@ -487,10 +567,10 @@ class IngestionService:
             payload["source_id"] = chunk.metadata.source_id
             payload["content_hash"] = chunk.metadata.content_hash
 
-            point_uuid = uuid5(NAMESPACE_DNS, chunk.metadata.chunk_id)
+            point_uuid = derive_point_id(chunk.metadata.chunk_id)
 
             point: dict[str, object] = {
-                "id": str(point_uuid),
+                "id": point_uuid,
                 "payload": payload,
             }
 
@@ -517,6 +597,9 @@ class IngestionService:
         When ``active_ids_by_source_type`` is provided (embed-chunks), each group uses the
         full active rag_chunks id set so partial batches still remove historical orphans.
         Otherwise falls back to the ids delivered in this upload batch only.
+
+        Existing points are scrolled page by page and each page's stale ids are deleted
+        before the next page is fetched, so memory stays bounded by one page.
         """
 
         if not chunks:
@@ -541,30 +624,30 @@ class IngestionService:
                 active_ids = batch_ids
 
             total_groups += 1
-            existing_points = await self.qdrant_client.scroll_all_points(
+            # Deleting already-scrolled points is safe: the next-page offset is a
+            # point id from the following page.
+            async for page in self.qdrant_client.scroll_points_iter(
                 collection,
                 filter_=self._qdrant_filter_for_source_and_type(source_id, chunk_type),
                 limit=512,
                 with_payload=True,
                 with_vectors=False,
-            )
-            existing_ids: list[str] = []
-            for item in existing_points:
-                payload = item.get("payload") or {}
-                cid = payload.get("chunk_id")
-                if isinstance(cid, str) and cid:
-                    existing_ids.append(cid)
-
-            stale_ids = [cid for cid in existing_ids if cid not in active_ids]
-            if not stale_ids:
-                continue
-            total_stale += len(stale_ids)
-            point_uuids = [str(uuid5(NAMESPACE_DNS, cid)) for cid in stale_ids]
-            await self.qdrant_client.delete_points(collection, point_uuids)
-            try:
-                await self.vector_chunks_repository.delete_chunks(collection, stale_ids)
-            except Exception:
-                pass
+            ):
+                stale_ids: list[str] = []
+                for item in page:
+                    payload = item.get("payload") or {}
+                    cid = payload.get("chunk_id")
+                    if isinstance(cid, str) and cid and cid not in active_ids:
+                        stale_ids.append(cid)
+                if not stale_ids:
+                    continue
+                total_stale += len(stale_ids)
+                point_uuids = [derive_point_id(cid) for cid in stale_ids]
+                await self.qdrant_client.delete_points(collection, point_uuids)
+                try:
+                    await self.vector_chunks_repository.delete_chunks(collection, stale_ids)
+                except Exception:
+                    pass
 
         return (total_groups, total_stale)
 
@@ -41,6 +41,12 @@ from app.retrieval.utils.retrievers import build_context
 logger = logging.getLogger(__name__)
 
 
+def _validate_prompt_files(worldviews: Sequence[str]) -> None:
+    """Fail fast (ValueError) if any requested worldview lacks its prompt files."""
+    for wv in worldviews:
+        ensure_worldview_prompts_exist(worldview=wv)
+
+
 async def run_translate_to_worldview_graph(
     *,
     text: str,
@@ -64,8 +70,7 @@ async def run_translate_to_worldview_graph(
         raise ValueError("worldviews must not be empty")
 
     # Fail fast: ensure prompt files exist for all requested worldviews.
-    for wv in worldviews:
-        ensure_worldview_prompts_exist(worldview=wv)
+    _validate_prompt_files(worldviews)
 
     # Reuse concept_explain_worldviews RetrievalConfig defaults + settings finals.
     if cfg is None:
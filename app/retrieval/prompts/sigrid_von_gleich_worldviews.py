@@ -21,15 +21,15 @@ from typing import Mapping
 from app.config import settings
 
 
-def _resolve_assistants_root() -> Path:
+def _resolve_assistants_root(assistants_root: str) -> Path:
     repo_root = Path(__file__).resolve().parents[3]
-    configured = Path(settings.assistants_root)
+    configured = Path(assistants_root)
     return configured if configured.is_absolute() else (repo_root / configured)
 
 
-def _worldview_prompts_dir(worldview: str) -> Path:
+def _worldview_prompts_dir(worldview: str, assistants_root: str | None = None) -> Path:
     return (
-        _resolve_assistants_root()
+        _resolve_assistants_root(assistants_root or settings.assistants_root)
         / "sigrid-von-gleich"
         / "worldviews"
         / worldview
@@ -43,14 +43,16 @@ def _read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8").strip()
 
 
+# Loaders are keyed on assistants_root so a different root is a cache miss,
+# not a stale hit; callers pass settings.assistants_root.
 @lru_cache(maxsize=256)
-def _load_prompt_file(worldview: str, filename: str) -> str:
-    return _read_text(_worldview_prompts_dir(worldview) / filename)
+def _load_prompt_file(assistants_root: str, worldview: str, filename: str) -> str:
+    return _read_text(_worldview_prompts_dir(worldview, assistants_root) / filename)
 
 
 @lru_cache(maxsize=256)
-def _load_worldview_description(worldview: str) -> str:
-    prompts_dir = _worldview_prompts_dir(worldview)
+def _load_worldview_description(assistants_root: str, worldview: str) -> str:
+    prompts_dir = _worldview_prompts_dir(worldview, assistants_root)
     for name in ("instructions.prompt", "instructions.md"):
         p = prompts_dir / name
         if p.is_file():
@@ -75,8 +77,8 @@ def ensure_worldview_prompts_exist(*, worldview: str) -> None:
 def render_worldview_what(*, worldview: str, concept_explanation: str, context1_k5: str) -> str:
     """Render the per-worldview WHAT prompt into a user message content string."""
     ensure_worldview_prompts_exist(worldview=worldview)
-    template = _load_prompt_file(worldview, "concept-explain-what.prompt")
-    desc = _load_worldview_description(worldview)
+    template = _load_prompt_file(settings.assistants_root, worldview, "concept-explain-what.prompt")
+    desc = _load_worldview_description(settings.assistants_root, worldview)
     return (
         template.replace("{{CONCEPT_EXPLANATION}}", (concept_explanation or "").strip())
         .replace("{{CONTEXT1_K5}}", (context1_k5 or "").strip())
@@ -94,8 +96,8 @@ def render_worldview_how(
 ) -> str:
     """Render the per-worldview HOW prompt into a user message content string."""
     ensure_worldview_prompts_exist(worldview=worldview)
-    template = _load_prompt_file(worldview, "concept-explain-how.prompt")
-    desc = _load_worldview_description(worldview)
+    template = _load_prompt_file(settings.assistants_root, worldview, "concept-explain-how.prompt")
+    desc = _load_worldview_description(settings.assistants_root, worldview)
     return (
         template.replace("{{CONCEPT_EXPLANATION}}", (concept_explanation or "").strip())
         .replace("{{CONTEXT2_K10}}", (context2_k10 or "").strip())
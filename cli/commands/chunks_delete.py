@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Mapping
 from pathlib import Path
-from uuid import NAMESPACE_DNS, uuid5
+from types import MappingProxyType
+from typing import Any
 
 from rich.console import Console
 from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
 
 from app.config import settings
 from app.db.session import get_engine
 from app.db.tables import vector_chunks_table
 from app.ingestion.repositories import RagChunksRepository, VectorChunksRepository
+from app.ingestion.services.ingestion_service import derive_point_id
 from app.infra.qdrant_client import QdrantClient
 
 
@@ -32,53 +36,81 @@ def _resolve_assistant(assistant: str) -> str:
     return assistant
 
 
+# User-facing --chunk-types value -> DB chunk_type values.
+_TYPE_MAP: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "book": ("book", "chapter_summary", "secondary_book"),
+        "concept": ("begriff",),
+    }
+)
+
+
 def _map_chunk_types(user_types: list[str]) -> list[str]:
     """Map user-facing chunk types (book, concept) to DB chunk_type values."""
-    mapping = {
-        "book": ["book", "chapter_summary", "secondary_book"],
-        "concept": ["begriff"],
-    }
     result: list[str] = []
+    seen: set[str] = set()
     for t in user_types:
-        t = (t or "").strip().lower()
-        if t in mapping:
-            result.extend(mapping[t])
-    return list(dict.fromkeys(result))  # preserve order, dedupe
-
-
-def _list_books(engine, collection: str) -> list[tuple[str, str, int, str | None, str | None]]:
-    """List books (source_id) with metadata. Only types 'book' and 'secondary_book'."""
+        for db_type in _TYPE_MAP.get((t or "").strip().lower(), ()):
+            if db_type not in seen:  # preserve order, dedupe
+                seen.add(db_type)
+                result.append(db_type)
+    return result
+
+
+def _list_books(
+    conn: Connection, collection: str
+) -> list[tuple[str, str | None, str | None, list[dict[str, Any]], int]]:
+    """List books (source_id) with metadata. Only types 'book' and 'secondary_book'.
+
+    Grouping per source_id happens in Postgres: each row is
+    ``(source_id, title, author, parts, total)`` where ``parts`` is a list of
+    ``{"ct": chunk_type, "cnt": count}`` objects. Rows are ordered by title.
+    """
     query = text(
         """
-        SELECT source_id, chunk_type, COUNT(*) as cnt,
-               MAX(COALESCE(metadata->>'source_title', metadata->>'book_title')) as source_title,
-               MAX(metadata->>'author') as author
-        FROM vector_chunks
-        WHERE collection = :coll AND chunk_type IN ('book', 'secondary_book')
-        GROUP BY source_id, chunk_type
-        ORDER BY source_title, source_id
+        SELECT source_id,
+               MAX(source_title) AS title,
+               MAX(author) AS author,
+               jsonb_agg(jsonb_build_object('ct', chunk_type, 'cnt', cnt) ORDER BY chunk_type) AS parts,
+               SUM(cnt) AS total
+        FROM (
+            SELECT source_id, chunk_type, COUNT(*) AS cnt,
+                   MAX(COALESCE(metadata->>'source_title', metadata->>'book_title')) AS source_title,
+                   MAX(metadata->>'author') AS author
+            FROM vector_chunks
+            WHERE collection = :coll AND chunk_type IN ('book', 'secondary_book')
+            GROUP BY source_id, chunk_type
+        ) per_type
+        GROUP BY source_id
+        ORDER BY COALESCE(MAX(source_title), source_id), source_id
         """
     )
-    rows = engine.connect().execute(query, {"coll": collection}).fetchall()
-    return [(r[0], r[1], r[2], r[3], r[4]) for r in rows]
+    rows = conn.execute(query, {"coll": collection}).fetchall()
+    return [(r[0], r[1], r[2], list(r[3] or []), int(r[4] or 0)) for r in rows]
 
 
-_CHUNK_TYPE_MAP = {
-    "summary": "chapter_summary",  # map user-facing "summary" to DB value
-}
+_CHUNK_TYPE_MAP: Mapping[str, str] = MappingProxyType(
+    {
+        "summary": "chapter_summary",  # map user-facing "summary" to DB value
+    }
+)
 
 
 def _get_chunk_ids(
-    engine,
+    conn: Connection | None,
     collection: str,
     book_dir: str | None,
     chunk_types: list[str] | None,
     chunk_type: str | None,  # single type from --chunk-type
     chunk_ids: list[str] | None,
 ) -> list[str]:
-    """Resolve chunk_ids to delete: from explicit list or from Postgres query."""
+    """Resolve chunk_ids to delete: from explicit list or from Postgres query.
+
+    ``conn`` is only used for the Postgres query; pass None for explicit ids.
+    """
     if chunk_ids:
-        return [cid for cid in chunk_ids if isinstance(cid, str) and cid.strip()]
+        # dict.fromkeys: drop repeated ids (preserve order) before hashing/deleting
+        return list(dict.fromkeys(cid for cid in chunk_ids if isinstance(cid, str) and cid.strip()))
 
     db_type = _CHUNK_TYPE_MAP.get(chunk_type, chunk_type) if chunk_type else None
     filters: list = [vector_chunks_table.c.collection == collection]
@@ -94,14 +126,13 @@ def _get_chunk_ids(
         return []
 
     q = select(vector_chunks_table.c.chunk_id).where(*filters)
-
-    with engine.connect() as conn:
-        rows = conn.execute(q).fetchall()
+    rows = conn.execute(q).fetchall()
     return [r[0] for r in rows]
 
 
 async def _delete_chunks(collection: str, chunk_ids: list[str]) -> None:
     """Delete chunks from Qdrant and Postgres."""
+    chunk_ids = list(dict.fromkeys(chunk_ids))
     if not chunk_ids:
         return
 
@@ -110,7 +141,7 @@ async def _delete_chunks(collection: str, chunk_ids: list[str]) -> None:
         api_key=settings.qdrant_api_key,
         timeout=60.0,
     )
-    point_uuids = [str(uuid5(NAMESPACE_DNS, cid)) for cid in chunk_ids]
+    point_uuids = [derive_point_id(cid) for cid in chunk_ids]
     await client.delete_points(collection, point_uuids)
 
     engine = get_engine()
@@ -145,10 +176,12 @@ def run_chunks_delete(
 
     # If --chunk-id provided: delete those IDs (ignore --book, --chunk-type)
     if chunk_id:
-        ids = _get_chunk_ids(engine, collection, None, None, None, chunk_id)
+        ids = _get_chunk_ids(None, collection, None, None, None, chunk_id)
         if not ids:
             console.print("[yellow]No valid chunk_ids provided.[/]")
             return
+        if len(ids) < len(chunk_id):
+            console.print(f"[dim]Ignoring {len(chunk_id) - len(ids)} duplicate or empty chunk_id(s).[/]")
         if dry_run:
             console.print(f"[bold blue]Dry run: would delete {len(ids)} chunks[/]")
             console.print(f"[dim]Collection: {collection}[/]")
@@ -173,44 +206,43 @@ def run_chunks_delete(
             raise SystemExit(1) from e
         return
 
+    list_books = book is not None and isinstance(book, str) and book.strip() == ""
+    book_dir = book.strip() if book and isinstance(book, str) else None
+
+    # One connection for the whole lookup phase (NullPool: each connect is a new session).
+    with engine.connect() as conn:
+        if list_books:
+            rows = _list_books(conn, collection)
+        else:
+            # Resolve chunk_ids to delete (--chunk-type and/or --book with value)
+            ids = _get_chunk_ids(
+                conn,
+                collection,
+                book_dir,
+                mapped_types if not chunk_type else None,
+                chunk_type,
+                chunk_id,
+            )
+
     # If --book with no value: list books and exit (only book/secondary_book types)
-    if book is not None and isinstance(book, str) and book.strip() == "":
-        rows = _list_books(engine, collection)
+    if list_books:
         if not rows:
             console.print(f"[yellow]No books found for collection '{collection}'.[/]")
             return
 
-        by_source: dict[str, list[tuple[str, int, str | None, str | None]]] = {}
-        for src, ct, cnt, source_title, author in rows:
-            by_source.setdefault(src, []).append((ct, cnt, source_title, author))
-
         console.print(f"[bold blue]Books (book, secondary_book) in collection '{collection}':[/]")
         console.print()
-        for src in sorted(by_source.keys(), key=lambda s: (by_source[s][0][2] or s, s)):
-            parts = by_source[src]
-            total = sum(p[1] for p in parts)
-            title = parts[0][2] if parts[0][2] else src
-            author_str = f" – {parts[0][3]}" if parts[0][3] else ""
-            console.print(f"  [yellow]{title}[/]{author_str}")
+        for src, title, author, parts, total in rows:
+            author_str = f" – {author}" if author else ""
+            console.print(f"  [yellow]{title or src}[/]{author_str}")
             console.print(f"    [dim]source_id:[/] {src}")
-            for ct, cnt, _, _ in parts:
-                console.print(f"    [dim]{ct}:[/] {cnt} chunks")
+            for part in parts:
+                console.print(f"    [dim]{part['ct']}:[/] {part['cnt']} chunks")
             console.print(f"    [dim]Total:[/] {total} chunks")
             console.print()
         console.print("[dim]Use --book <source_id> to delete chunks for a specific book.[/]")
         return
 
-    # Resolve chunk_ids to delete (--chunk-type and/or --book with value)
-    book_dir = book.strip() if book and isinstance(book, str) else None
-    ids = _get_chunk_ids(
-        engine,
-        collection,
-        book_dir,
-        mapped_types if not chunk_type else None,
-        chunk_type,
-        chunk_id,
-    )
-
     if not ids:
         desc = f"chunk_type={chunk_type}" if chunk_type else f"book '{book}'"
         if chunk_type and book_dir:
@@ -9,9 +9,10 @@ from typing import Any
 
 from rich.console import Console
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.config import settings
-from app.db.session import get_engine
+from app.db.async_session import create_standalone_async_engine
 from app.infra.qdrant_client import QdrantClient
 
 
@@ -141,30 +142,35 @@ async def _fetch_qdrant(collection: str) -> dict[str, Any]:
     }
 
 
-def _fetch_postgres(collection: str) -> dict[str, Any]:
-    """Fetch Postgres vector_chunks stats for collection."""
-    engine = get_engine()
-    with engine.connect() as conn:
-        version_row = conn.execute(text("SELECT version()")).fetchone()
-        pg_version = version_row[0] if version_row else "unknown"
-
-        count_row = conn.execute(
+async def _fetch_postgres(conn: AsyncConnection, collection: str) -> dict[str, Any]:
+    """Fetch Postgres vector_chunks stats for collection on an open connection."""
+    # One roundtrip: per-type aggregates in the subquery, rolled up outside.
+    row = (
+        await conn.execute(
             text(
-                "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM vector_chunks WHERE collection = :coll"
+                """
+                SELECT version(),
+                       COALESCE(SUM(cnt), 0),
+                       MIN(oldest),
+                       MAX(newest),
+                       jsonb_object_agg(chunk_type, cnt)
+                FROM (
+                    SELECT chunk_type, COUNT(*) AS cnt,
+                           MIN(created_at) AS oldest, MAX(created_at) AS newest
+                    FROM vector_chunks
+                    WHERE collection = :coll
+                    GROUP BY chunk_type
+                ) per_type
+                """
             ),
             {"coll": collection},
-        ).fetchone()
-        total = count_row[0] or 0
-        oldest = count_row[1] if count_row else None
-        newest = count_row[2] if count_row else None
-
-        type_rows = conn.execute(
-            text(
-                "SELECT chunk_type, COUNT(*) FROM vector_chunks WHERE collection = :coll GROUP BY chunk_type"
-            ),
-            {"coll": collection},
-        ).fetchall()
-        chunk_types = {row[0]: row[1] for row in type_rows}
+        )
+    ).fetchone()
+    pg_version = (row[0] if row else None) or "unknown"
+    total = int(row[1] or 0) if row else 0
+    oldest = row[2] if row else None
+    newest = row[3] if row else None
+    chunk_types = dict(row[4] or {}) if row else {}
 
     return {
         "version": pg_version,
@@ -175,24 +181,42 @@ def _fetch_postgres(collection: str) -> dict[str, Any]:
     }
 
 
+async def _fetch_postgres_stats(collection: str) -> dict[str, Any]:
+    """Open one async connection on a dedicated engine, fetch stats, and dispose it."""
+    engine = create_standalone_async_engine()
+    try:
+        async with engine.connect() as conn:
+            return await _fetch_postgres(conn, collection)
+    finally:
+        # Only this command's engine is disposed; the shared cached engine is untouched.
+        await engine.dispose()
+
+
+async def _fetch_all(collection: str) -> list[Any]:
+    """Query Qdrant and Postgres concurrently; exceptions are returned, not raised."""
+    return await asyncio.gather(
+        _fetch_qdrant(collection),
+        _fetch_postgres_stats(collection),
+        return_exceptions=True,
+    )
+
+
 def run_chunks_info(assistant: str) -> None:
     """Run chunks:info for the given assistant/collection."""
     console = Console()
     collection = _resolve_assistant(assistant.strip())
 
-    try:
-        qdrant_data = asyncio.run(_fetch_qdrant(collection))
-    except Exception as e:
-        console.print(f"[red]Qdrant error:[/] {e}")
+    qdrant_data, pg_data = asyncio.run(_fetch_all(collection))
+
+    if isinstance(qdrant_data, BaseException):
+        console.print(f"[red]Qdrant error:[/] {qdrant_data}")
         console.print("[dim]Ensure Qdrant is running (e.g. docker-compose up -d qdrant) and RAGRUN_QDRANT_URL is set.[/]")
-        raise SystemExit(1) from e
+        raise SystemExit(1) from qdrant_data
 
-    try:
-        pg_data = _fetch_postgres(collection)
-    except Exception as e:
-        console.print(f"[red]Postgres error:[/] {e}")
+    if isinstance(pg_data, BaseException):
+        console.print(f"[red]Postgres error:[/] {pg_data}")
         console.print("[dim]Ensure Postgres is running and RAGRUN_POSTGRES_DSN is set.[/]")
-        raise SystemExit(1) from e
+        raise SystemExit(1) from pg_data
 
     if qdrant_data["total"] == 0 and not qdrant_data.get("collection_exists", True):
         console.print(f"[yellow]Collection '{collection}' not found in Qdrant.[/]")
@@ -2,7 +2,9 @@ import logging
 import time
 from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from app.services.batch_service import batch_service
@@ -80,7 +82,7 @@ async def create_embeddings(request: EmbeddingRequest):
         )
         processing_time = time.time() - start_time
 
-        embeddings_list, count, dimensions = _normalize_embeddings(embeddings)
+        matrix, count, dimensions = _normalize_embeddings(embeddings)
         logger.info(
             "Embedded %d chunks with size %.1fKB",
             count,
@@ -94,12 +96,16 @@ async def create_embeddings(request: EmbeddingRequest):
             model_name=model_name,
         )
 
-        return EmbeddingResponse(
-            embeddings=embeddings_list,
-            dimensions=dimensions,
-            model=model_name,
-            processing_time=processing_time,
-            count=count,
+        # orjson serializes the ndarray natively (OPT_SERIALIZE_NUMPY), skipping
+        # the per-float boxing of .tolist() and Pydantic re-validation.
+        return ORJSONResponse(
+            {
+                "embeddings": matrix,
+                "dimensions": dimensions,
+                "model": model_name,
+                "processing_time": processing_time,
+                "count": count,
+            }
         )
     except HTTPException:
         raise
@@ -220,13 +226,17 @@ async def get_service_info():
         raise HTTPException(status_code=500, detail=f"Failed to get service info: {exc}")
 
 
-def _normalize_embeddings(embeddings) -> tuple[List[List[float]], int, int]:
-    if embeddings.ndim == 1:
-        embeddings_list = [embeddings.tolist()]
-        count = 1
-        dimensions = embeddings.shape[0]
-    else:
-        embeddings_list = embeddings.tolist()
-        count = len(embeddings_list)
-        dimensions = len(embeddings_list[0]) if embeddings_list else 0
-    return embeddings_list, count, dimensions
+def _normalize_embeddings(embeddings: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """Return the (count, dimensions) matrix from encode_texts, C-contiguous for orjson.
+
+    An empty result (the encoder may hand back a bare 1-D array) becomes an
+    empty ``(0, 0)`` matrix instead of failing to unpack its shape; a single
+    1-D vector becomes one row.
+    """
+    matrix = np.ascontiguousarray(embeddings)
+    if matrix.size == 0:
+        return np.empty((0, 0), dtype=matrix.dtype), 0, 0
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(-1, matrix.shape[-1])
+    count, dimensions = matrix.shape
+    return matrix, count, dimensions
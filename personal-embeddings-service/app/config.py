@@ -1,5 +1,5 @@
 # pyright: reportMissingImports=false
-from typing import List, Optional
+from typing import FrozenSet, Optional
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
@@ -9,13 +9,27 @@ class Settings(BaseSettings):
     """Environment configuration for the embedding service."""
 
     model_name: str = "T-Systems-onsite/cross-en-de-roberta-sentence-transformer"
-    allowed_models: List[str] = []
+    allowed_models: FrozenSet[str] = frozenset()
     max_seq_length: int = 512
+    # Texts per model forward pass (length-sorted slices of larger batches).
     batch_size: int = 32
     embedding_dimension: int = 768
 
     use_half_precision: bool = True
+    # dtype of returned/cached embeddings ("float32" or "float16"). float16 halves
+    # payloads but rounds vectors; deployments opt in explicitly.
+    embedding_dtype: str = "float32"
+    # Unused: inference runs on a single dedicated thread. Kept so existing
+    # EMBEDDINGS_MAX_WORKERS entries in .env files still parse.
     max_workers: int = 4
+    # Micro-batching: concurrent encode requests are merged up to this many
+    # texts, waiting at most max_batch_delay_ms for more to arrive.
+    max_batch_size: int = 64
+    max_batch_delay_ms: float = 5.0
+    # Entries in the per-text embedding LRU used by encode_texts (0 disables it).
+    embedding_cache_size: int = 10_000
+    # Seconds a healthy health_check result is reused before re-encoding.
+    health_check_ttl_seconds: float = 30.0
     cache_dir: str = "/app/models"
 
     host: str = "0.0.0.0"
@@ -26,19 +40,31 @@ class Settings(BaseSettings):
     langfuse_secret_key: Optional[str] = None
     langfuse_dataset: str = "embedding_runs"
     telemetry_timeout_seconds: float = 3.0
+    # Telemetry events are buffered and posted together every telemetry_flush_ms,
+    # or as soon as telemetry_flush_max_events are waiting.
+    telemetry_flush_ms: float = 1000.0
+    telemetry_flush_max_events: int = 100
 
     class Config:
         env_file = ".env"
         env_prefix = "EMBEDDINGS_"
 
+    @field_validator("embedding_dtype")
+    @classmethod
+    def _check_embedding_dtype(cls, value: str) -> str:
+        value = value.strip().lower()
+        if value not in ("float16", "float32"):
+            raise ValueError("embedding_dtype must be 'float16' or 'float32'")
+        return value
+
     @field_validator("allowed_models", mode="before")
     @classmethod
     def _parse_allowed_models(cls, value):
         if value is None or value == "":
-            return []
+            return frozenset()
         if isinstance(value, str):
-            return [item.strip() for item in value.split(",") if item.strip()]
-        return value
+            return frozenset(item.strip() for item in value.split(",") if item.strip())
+        return frozenset(value)
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from app.api.router import api_router
 from app.config import settings
 from app.services.embedding_service import embedding_service
+from app.services.telemetry import telemetry_client
 
 _log_level_str = (
     os.environ.get("EMBEDDINGS_LOG_LEVEL")
@@ -41,7 +42,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Personal Embeddings Service")
-    # Add any cleanup code here if needed
+    await embedding_service.shutdown()
+    await telemetry_client.aclose()
 
 app = FastAPI(
     title="Personal Embeddings Service",
@@ -1,8 +1,12 @@
 import asyncio
+import functools
+import hashlib
 import logging
 import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -11,14 +15,95 @@ from app.models.embedding_model import EmbeddingModel
 
 logger = logging.getLogger(__name__)
 
+# One thread owns the model; see LocalEmbeddingService.__init__.
+_INFERENCE_THREADS = 1
+
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the ``top_k`` highest scores, best first.
+
+    np.argpartition selects the candidates in O(N); only those k are sorted.
+    """
+    k = min(max(top_k, 0), scores.shape[0])
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _cosine_scores(
+    doc_matrix: np.ndarray, query_vec: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Dot products of unit-length rows with a unit query: one float32 BLAS sgemv.
+
+    ascontiguousarray is a no-op for the usual C-contiguous float32 inputs and
+    otherwise makes the single copy explicit, so ``@`` never falls back to a
+    strided or float64 path.
+    """
+    doc_matrix = np.ascontiguousarray(doc_matrix, dtype=np.float32)
+    query_vec = np.ascontiguousarray(query_vec, dtype=np.float32)
+    return np.matmul(doc_matrix, query_vec, out=out)
+
+
+def _cache_key(model_name: str, normalize: bool, text: str) -> Tuple[str, bool, bytes]:
+    """Embedding-cache key: model, normalize flag and a 128-bit blake2b digest of the text."""
+    return (
+        model_name,
+        normalize,
+        hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+    )
+
+
+@dataclass
+class _PendingEncode:
+    """One encode_texts call waiting in the micro-batch queue."""
+
+    model_name: str
+    normalize: bool
+    texts: List[str]
+    future: "asyncio.Future[np.ndarray]"
+
+
+def _drain_queue(
+    queue: "asyncio.Queue[_PendingEncode]", pending: List[_PendingEncode]
+) -> int:
+    """Move queued requests into ``pending`` up to max_batch_size texts; return the size."""
+    size = sum(len(item.texts) for item in pending)
+    while size < settings.max_batch_size and not queue.empty():
+        item = queue.get_nowait()
+        pending.append(item)
+        size += len(item.texts)
+    return size
+
 
 class LocalEmbeddingService:
     """Asynchronous embedding service using the configured model(s)."""
 
     def __init__(self) -> None:
         self.model = EmbeddingModel()
-        self.executor = ThreadPoolExecutor(max_workers=settings.max_workers)
+        # One thread owns the model: concurrent encode calls on the same torch
+        # model only contend; parallelism comes from micro-batching instead.
+        self.executor = ThreadPoolExecutor(
+            max_workers=_INFERENCE_THREADS, thread_name_prefix="embedding-inference"
+        )
         self.ready = False
+        # Model names form a tiny finite set; memoize validation per instance.
+        self._resolve_cached = functools.lru_cache(maxsize=16)(
+            self.model.normalize_model_name
+        )
+        # Resolved default model, bound in load_model; encode_texts skips
+        # resolution entirely for the common model_name=None call.
+        self._default_resolved: Optional[str] = None
+        # Last healthy health_check result and its monotonic timestamp.
+        self._health_result: Optional[Dict[str, Any]] = None
+        self._health_ts = 0.0
+        # Reused float32 score vector for similarity queries; see _score_buffer.
+        self._sim_buf = np.empty(0, dtype=np.float32)
+        # LRU of embeddings keyed by (model, normalize, blake2b(text)); see _cache_key.
+        self._embedding_cache: "OrderedDict[Tuple[str, bool, bytes], np.ndarray]" = OrderedDict()
+        # Dynamic micro-batching: concurrent encode_texts calls share one forward pass.
+        self._batch_queue: Optional["asyncio.Queue[_PendingEncode]"] = None
+        self._batch_worker: Optional["asyncio.Task[None]"] = None
 
     async def load_model(self, model_name: Optional[str] = None) -> None:
         """Load the default (or specific) model asynchronously."""
@@ -28,10 +113,11 @@ class LocalEmbeddingService:
 
         target = model_name or settings.model_name
         logger.info("Loading %s model asynchronously", target)
-        success = await asyncio.get_event_loop().run_in_executor(
+        success = await asyncio.get_running_loop().run_in_executor(
             self.executor, _load_model
         )
         if success:
+            self._default_resolved = self.resolve_model_name(None)
             self.ready = True
             logger.info("Embedding service ready")
         else:
@@ -40,24 +126,160 @@ class LocalEmbeddingService:
     def resolve_model_name(self, requested: Optional[str]) -> str:
         """Validate and normalize the requested model name."""
 
-        return self.model.normalize_model_name(requested)
+        return self._resolve_cached(requested)
 
     async def encode_texts(
-        self, texts: Union[str, List[str]], model_name: Optional[str] = None
+        self,
+        texts: Union[str, List[str]],
+        model_name: Optional[str] = None,
+        normalize: bool = False,
+        use_cache: bool = True,
     ) -> np.ndarray:
-        """Encode texts to embeddings asynchronously."""
+        """Encode texts to a 2D ``(len(texts), dim)`` embedding matrix.
+
+        A single string is treated as a one-element batch, so callers never
+        have to branch on ``ndim``. With ``normalize`` the rows come back as
+        L2-normalized float32, computed in the inference thread. With
+        ``use_cache=False`` the embedding cache is neither read nor written,
+        so the model always runs.
+        """
         if not self.ready:
             raise RuntimeError("Service not ready. Call load_model() first.")
 
-        resolved = self.resolve_model_name(model_name)
-
-        def _encode(texts_input: Union[str, List[str]]) -> np.ndarray:
-            return self.model.encode(texts_input, resolved)
+        if isinstance(texts, str):
+            texts = [texts]
 
-        embeddings = await asyncio.get_event_loop().run_in_executor(
-            self.executor, _encode, texts
+        resolved = (
+            self._default_resolved
+            if model_name is None
+            else self.resolve_model_name(model_name)
         )
-        return embeddings
+        if not use_cache:
+            return await self._submit_batch(resolved, normalize, texts)
+        keys = [_cache_key(resolved, normalize, text) for text in texts]
+
+        rows: Dict[Tuple[str, bool, bytes], np.ndarray] = {}
+        misses: Dict[Tuple[str, bool, bytes], str] = {}
+        for key, text in zip(keys, texts):
+            if key in rows or key in misses:
+                continue
+            cached = self._embedding_cache.get(key)
+            if cached is None:
+                misses[key] = text
+            else:
+                self._embedding_cache.move_to_end(key)
+                rows[key] = cached
+
+        if not misses and texts:
+            return np.stack([rows[key] for key in keys])
+
+        encoded = await self._submit_batch(resolved, normalize, list(misses.values()))
+        if settings.embedding_cache_size > 0:
+            for key, row in zip(misses, encoded):
+                self._embedding_cache[key] = row.copy()
+            while len(self._embedding_cache) > settings.embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+
+        if len(misses) == len(keys):  # all unique misses: already in request order
+            return encoded
+        rows.update(zip(misses, encoded))
+        return np.stack([rows[key] for key in keys])
+
+    def _encode_batch(
+        self, model_name: str, normalize: bool, texts: List[str]
+    ) -> np.ndarray:
+        """Run the model on one (coalesced) batch; executes in the executor.
+
+        Large batches are encoded in ``settings.batch_size`` slices of
+        length-sorted texts so each slice pads to a similar length, then the
+        rows are scattered back into request order.
+        """
+        step = max(settings.batch_size, 1)
+        if len(texts) <= step:
+            embeddings = self.model.encode(texts, model_name)
+        else:
+            order = np.argsort([len(t) for t in texts], kind="stable")
+            by_length = [texts[i] for i in order]
+            stacked = np.concatenate(
+                [
+                    self.model.encode(by_length[i : i + step], model_name)
+                    for i in range(0, len(by_length), step)
+                ]
+            )
+            embeddings = np.empty_like(stacked)
+            embeddings[order] = stacked
+        if normalize:
+            # Normalize here, off the event loop, from full-precision model output.
+            # Row norms via einsum: one fused square-and-sum pass over the matrix.
+            embeddings = np.array(embeddings, dtype=np.float32, order="C")
+            norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))
+            embeddings /= np.maximum(norms, 1e-12)[:, None]
+            return embeddings
+        # Output dtype follows embedding_dtype (float32 by default), never the
+        # model's inference precision: use_half_precision models return fp16 rows.
+        return np.asarray(embeddings).astype(settings.embedding_dtype, copy=False)
+
+    async def _submit_batch(
+        self, model_name: str, normalize: bool, texts: List[str]
+    ) -> np.ndarray:
+        """Queue texts for the micro-batcher and wait for their embeddings."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._batch_worker is None
+            or self._batch_worker.done()
+            or self._batch_worker.get_loop() is not loop
+        ):
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker = loop.create_task(self._run_batcher(self._batch_queue))
+
+        future: "asyncio.Future[np.ndarray]" = loop.create_future()
+        self._batch_queue.put_nowait(_PendingEncode(model_name, normalize, texts, future))
+        return await future
+
+    async def _run_batcher(self, queue: "asyncio.Queue[_PendingEncode]") -> None:
+        """Collect queued requests for up to max_batch_delay_ms / max_batch_size texts."""
+        loop = asyncio.get_running_loop()
+        delay = settings.max_batch_delay_ms / 1000.0
+        while True:
+            pending = [await queue.get()]
+            if _drain_queue(queue, pending) < settings.max_batch_size and delay > 0:
+                await asyncio.sleep(delay)
+                _drain_queue(queue, pending)
+
+            by_model: Dict[Tuple[str, bool], List[_PendingEncode]] = {}
+            for item in pending:
+                by_model.setdefault((item.model_name, item.normalize), []).append(item)
+
+            for (model_name, normalize), group in by_model.items():
+                # Concurrent callers may ask for the same text; encode it once.
+                unique = list(dict.fromkeys(t for item in group for t in item.texts))
+                try:
+                    embeddings = await loop.run_in_executor(
+                        self.executor, self._encode_batch, model_name, normalize, unique
+                    )
+                except Exception as exc:
+                    for item in group:
+                        if not item.future.done():
+                            item.future.set_exception(exc)
+                    continue
+
+                position = {text: idx for idx, text in enumerate(unique)}
+                for item in group:
+                    if not item.future.done():
+                        item.future.set_result(
+                            embeddings[[position[t] for t in item.texts]]
+                        )
+
+    async def shutdown(self) -> None:
+        """Stop the micro-batch worker (called from the app lifespan)."""
+        if self._batch_worker is not None and not self._batch_worker.done():
+            self._batch_worker.cancel()
+            try:
+                await self._batch_worker
+            except asyncio.CancelledError:
+                pass
+        self._batch_worker = None
+        self._batch_queue = None
 
     async def similarity_search(
         self,
@@ -68,17 +290,18 @@ class LocalEmbeddingService:
     ) -> List[Dict[str, Any]]:
         """Perform similarity search using local embeddings."""
         try:
-            query_embedding = await self.encode_texts(query, model_name=model_name)
-            doc_embeddings = await self.encode_texts(documents, model_name=model_name)
-
-            if query_embedding.ndim == 2:
-                query_embedding = query_embedding[0]
+            # One batch (one executor hop, one forward pass) for query + documents.
+            embeddings = await self.encode_and_normalize(
+                [query, *documents], model_name
+            )
+            query_vec, doc_matrix = embeddings[0], embeddings[1:]
 
-            similarities = np.dot(doc_embeddings, query_embedding) / (
-                np.linalg.norm(doc_embeddings, axis=1) * np.linalg.norm(query_embedding)
+            # Rows are unit length, so cosine similarity is a single BLAS sgemv.
+            similarities = _cosine_scores(
+                doc_matrix, query_vec, out=self._score_buffer(len(documents))
             )
 
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+            top_indices = _top_k_indices(similarities, top_k)
 
             results = []
             for idx in top_indices:
@@ -96,13 +319,31 @@ class LocalEmbeddingService:
             logger.error("Failed to perform similarity search: %s", e)
             raise
 
+    def _score_buffer(self, size: int) -> np.ndarray:
+        """A ``(size,)`` view of the shared score buffer, grown by doubling.
+
+        Scores are read back into Python floats before the caller yields to
+        the event loop, so one buffer serves every query.
+        """
+        if self._sim_buf.shape[0] < size:
+            self._sim_buf = np.empty(max(size, 2 * self._sim_buf.shape[0]), dtype=np.float32)
+        return self._sim_buf[:size]
+
+    async def encode_and_normalize(
+        self, texts: List[str], model_name: Optional[str] = None
+    ) -> np.ndarray:
+        """Return L2-normalized float32 embeddings as a C-contiguous (N, D) matrix."""
+        return await self.encode_texts(texts, model_name=model_name, normalize=True)
+
     def get_service_info(self) -> Dict[str, Any]:
         """Return service information."""
         return {
             "ready": self.ready,
             "models": self.model.get_model_info(),
             "default_model": self.model.default_model_name,
-            "max_workers": settings.max_workers,
+            # Existing consumers read this key; it reports the real inference
+            # thread count, not the unused EMBEDDINGS_MAX_WORKERS setting.
+            "max_workers": _INFERENCE_THREADS,
         }
 
     async def health_check(self) -> Dict[str, Any]:
@@ -111,22 +352,32 @@ class LocalEmbeddingService:
             if not self.ready:
                 return {"status": "unhealthy", "error": "Service not ready"}
 
+            # Frequent liveness probes reuse a recent result instead of
+            # running a forward pass each time.
+            if (
+                self._health_result is not None
+                and time.monotonic() - self._health_ts < settings.health_check_ttl_seconds
+            ):
+                return self._health_result
+
             start_time = time.time()
-            test_embedding = await self.encode_texts("health check test")
+            # Bypass the embedding cache: the probe must exercise the model.
+            test_embedding = await self.encode_texts(
+                "health check test", use_cache=False
+            )
             processing_time = time.time() - start_time
 
-            if test_embedding.ndim == 1:
-                dimension = test_embedding.shape[0]
-            else:
-                dimension = test_embedding.shape[1]
+            dimension = test_embedding.shape[1]
 
-            return {
+            self._health_result = {
                 "status": "healthy",
                 "model": self.model.default_model_name,
                 "device": self.model.device,
                 "embedding_dimension": int(dimension),
                 "test_processing_time": processing_time,
             }
+            self._health_ts = time.monotonic()
+            return self._health_result
 
         except Exception as e:
             logger.error("Health check failed: %s", e)
@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import time
 import uuid
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
 
 import httpx
 
@@ -13,19 +15,67 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Userspace PRNG seeded once from the OS; trace ids do not need CSPRNG output.
+_rng = random.Random()
+
+
+def _trace_id() -> str:
+    """Return a UUIDv7-style id: 48-bit unix ms timestamp followed by random bits.
+
+    Ids sort by creation time, which keeps LangFuse's trace index append-mostly.
+    """
+
+    ms = time.time_ns() // 1_000_000
+    rand = _rng.getrandbits(74)
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (rand >> 62) << 64
+        | 0b10 << 62
+        | (rand & ((1 << 62) - 1))
+    )
+    return str(uuid.UUID(int=value))
+
+
+def _iso_now() -> str:
+    """Current UTC time as the ISO 8601 string LangFuse's ingestion API expects."""
+
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
 
 class TelemetryClient:
-    """Sends embedding metrics to LangFuse when configured."""
+    """Sends embedding metrics to LangFuse when configured.
+
+    Each record becomes a ``trace-create`` ingestion event. Events are
+    buffered and posted as one ``{"batch": [...]}`` request every
+    ``telemetry_flush_ms`` or once ``telemetry_flush_max_events`` accumulate.
+    """
 
     def __init__(self) -> None:
-        self.host = settings.langfuse_host.rstrip("/") if settings.langfuse_host else None
+        self.host = str(settings.langfuse_host).rstrip("/") if settings.langfuse_host else None
         self.public_key = settings.langfuse_public_key
         self.secret_key = settings.langfuse_secret_key
         self.dataset = settings.langfuse_dataset
         self.enabled = bool(self.host and self.public_key and self.secret_key)
         self._endpoint = (
-            f"{self.host}/api/public/ingestion/events" if self.host else None
+            f"{self.host}/api/public/ingestion" if self.host else None
         )
+        # The public ingestion API authenticates with HTTP Basic (public:secret).
+        self._auth = httpx.BasicAuth(self.public_key or "", self.secret_key or "")
+        # One pooled client for the process lifetime (created on first send);
+        # in-flight sends are tracked so they are not garbage collected early.
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Set[asyncio.Task] = set()
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.telemetry_timeout_seconds,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return self._client
 
     async def record_embedding_batch(
         self,
@@ -37,29 +87,65 @@ class TelemetryClient:
         if not self.enabled or not self._endpoint:
             return
 
-        payload: Dict[str, Any] = {
-            "traceId": str(uuid.uuid4()),
-            "name": "embedding_batch",
-            "timestamp": int(time.time() * 1000),
-            "dataset": self.dataset,
-            "metadata": {
-                "route": route,
-                "count": count,
-                "duration_ms": round(duration_seconds * 1000, 3),
-                "model": model_name,
-            },
-        }
-        headers = {
-            "Content-Type": "application/json",
-            "X-Langfuse-Public-Key": self.public_key,
-            "X-Langfuse-Secret-Key": self.secret_key,
-        }
+        timestamp = _iso_now()
+        self._buffer.append(
+            {
+                "id": _trace_id(),
+                "type": "trace-create",
+                "timestamp": timestamp,
+                "body": {
+                    "id": _trace_id(),
+                    "name": "embedding_batch",
+                    "timestamp": timestamp,
+                    "metadata": {
+                        "dataset": self.dataset,
+                        "route": route,
+                        "count": count,
+                        "duration_ms": round(duration_seconds * 1000, 3),
+                        "model": model_name,
+                    },
+                },
+            }
+        )
+
+        if len(self._buffer) >= settings.telemetry_flush_max_events:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.telemetry_flush_ms / 1000.0)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        """Hand the buffered events to a background send (fire-and-forget)."""
 
+        if not self._buffer:
+            return
+        events, self._buffer = self._buffer, []
+        task = asyncio.create_task(self._send({"batch": events}))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, payload: Dict[str, Any]) -> None:
         try:
-            async with httpx.AsyncClient(timeout=settings.telemetry_timeout_seconds) as client:
-                await client.post(self._endpoint, json=payload, headers=headers)
+            await self._get_client().post(self._endpoint, json=payload, auth=self._auth)
         except Exception as exc:  # pragma: no cover - best effort telemetry
             logger.debug("LangFuse telemetry failed: %s", exc)
 
+    async def aclose(self) -> None:
+        """Flush buffered events, wait for in-flight sends and close the client."""
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._flush()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 
 telemetry_client = TelemetryClient()
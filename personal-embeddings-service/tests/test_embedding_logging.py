@@ -1,4 +1,10 @@
-from app.api.endpoints.embeddings import _input_size_kb, _texts_from_request
+import numpy as np
+
+from app.api.endpoints.embeddings import (
+    _input_size_kb,
+    _normalize_embeddings,
+    _texts_from_request,
+)
 
 
 def test_input_size_kb_empty():
@@ -16,3 +22,15 @@ def test_texts_from_request_single():
 
 def test_texts_from_request_list():
     assert _texts_from_request(["a", "b"]) == ["a", "b"]
+
+
+def test_normalize_embeddings_empty_1d():
+    matrix, count, dimensions = _normalize_embeddings(np.array([], dtype=np.float32))
+    assert (count, dimensions) == (0, 0)
+    assert matrix.shape == (0, 0)
+
+
+def test_normalize_embeddings_single_vector():
+    matrix, count, dimensions = _normalize_embeddings(np.ones(3, dtype=np.float32))
+    assert (count, dimensions) == (1, 3)
+    assert matrix.flags["C_CONTIGUOUS"]
@@ -1,8 +1,10 @@
+import asyncio
+
 import numpy as np
 import pytest
 
 from app.config import settings
-from app.services.embedding_service import LocalEmbeddingService
+from app.services.embedding_service import LocalEmbeddingService, _top_k_indices
 
 
 @pytest.fixture(autouse=True)
@@ -32,6 +34,15 @@ async def test_embedding_service_initialization():
     assert not service.ready
 
 
+def test_service_info_keeps_max_workers_key(monkeypatch):
+    service = LocalEmbeddingService()
+    monkeypatch.setattr(service.model, "get_model_info", lambda: {}, raising=False)
+
+    info = service.get_service_info()
+
+    assert info["max_workers"] == 1
+
+
 @pytest.mark.asyncio
 async def test_single_text_embedding():
     service = LocalEmbeddingService()
@@ -40,7 +51,7 @@ async def test_single_text_embedding():
     embedding = await service.encode_texts("This is a test sentence.")
 
     assert isinstance(embedding, np.ndarray)
-    assert embedding.shape[0] == settings.embedding_dimension
+    assert embedding.shape == (1, settings.embedding_dimension)
     assert not np.isnan(embedding).any()
 
 
@@ -80,4 +91,259 @@ async def test_health_check():
     health = await service.health_check()
 
     assert health["status"] == "healthy"
-    assert health["embedding_dimension"] == settings.embedding_dimension
\ No newline at end of file
+    assert health["embedding_dimension"] == settings.embedding_dimension
+
+
+@pytest.mark.asyncio
+async def test_health_check_reuses_recent_result(monkeypatch):
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    first = await service.health_check()
+
+    async def fail_encode(*args, **kwargs):
+        raise AssertionError("health_check should not re-encode within the TTL")
+
+    monkeypatch.setattr(service, "encode_texts", fail_encode)
+    assert await service.health_check() is first
+
+    monkeypatch.setattr(settings, "health_check_ttl_seconds", 0.0)
+    assert (await service.health_check())["status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_health_check_runs_the_model_despite_cached_embedding(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        encoded_batches.append(list(texts))
+        return np.ones((len(texts), settings.embedding_dimension), dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    monkeypatch.setattr(settings, "health_check_ttl_seconds", 0.0)
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    await service.encode_texts("health check test")
+    assert (await service.health_check())["status"] == "healthy"
+    assert (await service.health_check())["status"] == "healthy"
+
+    assert encoded_batches == [["health check test"]] * 3
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_ranks_top_k_descending(monkeypatch):
+    vectors = {
+        "query": [1.0, 0.0],
+        "far": [0.0, 1.0],
+        "near": [1.0, 0.1],
+        "mid": [1.0, 1.0],
+        "exact": [2.0, 0.0],
+    }
+
+    def fake_encode(self, texts, model_name=None):
+        if isinstance(texts, str):
+            return np.array(vectors[texts], dtype=np.float32)
+        return np.array([vectors[t] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    results = await service.similarity_search(
+        "query", ["far", "near", "mid", "exact"], top_k=3
+    )
+
+    assert [r["document"] for r in results] == ["exact", "near", "mid"]
+    assert [r["index"] for r in results] == [3, 1, 2]
+    assert results[0]["score"] == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_similarity_search_reuses_cached_document_embeddings(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        if isinstance(texts, str):
+            return np.ones(settings.embedding_dimension, dtype=np.float32)
+        encoded_batches.append(list(texts))
+        return np.ones((len(texts), settings.embedding_dimension), dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    await service.similarity_search("q", ["a", "b", "a"], top_k=2)
+    await service.similarity_search("q", ["b", "c"], top_k=2)
+
+    assert encoded_batches == [["q", "a", "b"], ["c"]]
+
+
+@pytest.mark.parametrize(
+    ("top_k", "expected"),
+    [(2, [3, 0]), (10, [3, 0, 2, 1]), (0, []), (-1, [])],
+)
+def test_top_k_indices(top_k, expected):
+    scores = np.array([0.5, -0.2, 0.1, 0.9], dtype=np.float32)
+
+    assert _top_k_indices(scores, top_k).tolist() == expected
+
+
+@pytest.mark.asyncio
+async def test_encode_and_normalize_returns_unit_rows():
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    matrix = await service.encode_and_normalize(["a", "b"])
+
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_encode_and_normalize_keeps_zero_rows_finite(monkeypatch):
+    def fake_encode(self, texts, model_name=None):
+        return np.array([[float(len(t)), 0.0] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    matrix = await service.encode_and_normalize(["", "abc"])
+
+    assert matrix.tolist() == [[0.0, 0.0], [1.0, 0.0]]
+
+
+@pytest.mark.asyncio
+async def test_encode_texts_only_encodes_uncached_texts(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        encoded_batches.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    first = await service.encode_texts(["x", "yy", "x"])
+    second = await service.encode_texts(["yy", "zzz"])
+
+    assert encoded_batches == [["x", "yy"], ["zzz"]]
+    assert first[:, 0].tolist() == [1.0, 2.0, 1.0]
+    assert second[:, 0].tolist() == [2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_encode_calls_share_one_model_batch(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        encoded_batches.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    first, second, third = await asyncio.gather(
+        service.encode_texts(["a", "bb"]),
+        service.encode_texts(["ccc"]),
+        service.encode_texts(["bb", "dddd"]),
+    )
+    await service.shutdown()
+
+    assert encoded_batches == [["a", "bb", "ccc", "dddd"]]
+    assert first[:, 0].tolist() == [1.0, 2.0]
+    assert second[:, 0].tolist() == [3.0]
+    assert third[:, 0].tolist() == [2.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_large_batches_are_encoded_in_length_sorted_slices(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        encoded_batches.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    monkeypatch.setattr(settings, "batch_size", 2)
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    texts = ["cccc", "a", "eeeee", "bb", "ddd"]
+    embeddings = await service.encode_texts(texts)
+
+    assert encoded_batches == [["a", "bb"], ["ddd", "cccc"], ["eeeee"]]
+    assert embeddings[:, 0].tolist() == [4.0, 1.0, 5.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_half_precision_model_output_is_returned_as_float32(monkeypatch):
+    def fake_encode(self, texts, model_name=None):
+        return np.full((len(texts), 2), 0.1, dtype=np.float16)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    embeddings = await service.encode_texts(["a", "b"])
+
+    assert settings.embedding_dtype == "float32"
+    assert embeddings.dtype == np.float32
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dtype", ["float16", "float32"])
+async def test_encode_texts_returns_configured_dtype(monkeypatch, dtype):
+    monkeypatch.setattr(settings, "embedding_dtype", dtype)
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    embeddings = await service.encode_texts(["a", "b"])
+
+    assert embeddings.dtype == np.dtype(dtype)
+
+
+@pytest.mark.asyncio
+async def test_normalized_and_raw_embeddings_are_cached_separately(monkeypatch):
+    encoded_batches = []
+
+    def fake_encode(self, texts, model_name=None):
+        encoded_batches.append(list(texts))
+        return np.array([[3.0, 4.0] for _ in texts], dtype=np.float32)
+
+    monkeypatch.setattr(
+        "app.models.embedding_model.EmbeddingModel.encode", fake_encode, raising=False
+    )
+    monkeypatch.setattr(settings, "embedding_dtype", "float16")
+    service = LocalEmbeddingService()
+    await service.load_model()
+
+    raw = await service.encode_texts(["a"])
+    normalized = await service.encode_texts(["a"], normalize=True)
+    again = await service.encode_texts(["a"], normalize=True)
+
+    assert encoded_batches == [["a"], ["a"]]
+    assert raw.dtype == np.float16 and raw[0].tolist() == [3.0, 4.0]
+    assert normalized.dtype == np.float32
+    np.testing.assert_allclose(normalized[0], [0.6, 0.8])
+    np.testing.assert_array_equal(again, normalized)
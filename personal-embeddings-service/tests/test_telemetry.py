@@ -0,0 +1,114 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.telemetry import TelemetryClient
+
+
+@pytest.fixture
+def telemetry(monkeypatch):
+    """A configured TelemetryClient whose requests land in ``telemetry.sent``."""
+
+    monkeypatch.setattr(settings, "langfuse_host", "https://langfuse.test/")
+    monkeypatch.setattr(settings, "langfuse_public_key", "pk")
+    monkeypatch.setattr(settings, "langfuse_secret_key", "sk")
+    monkeypatch.setattr(settings, "telemetry_flush_ms", 60_000.0)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(207, json={"successes": [], "errors": []})
+
+    client = TelemetryClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.sent = requests
+    return client
+
+
+async def _record(telemetry: TelemetryClient, count: int = 1) -> None:
+    await telemetry.record_embedding_batch(
+        route="/embed", count=count, duration_seconds=0.25, model_name="e5"
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_is_posted_as_langfuse_ingestion_events(telemetry):
+    await _record(telemetry, count=3)
+    await telemetry.aclose()
+
+    assert len(telemetry.sent) == 1
+    request = telemetry.sent[0]
+    assert str(request.url) == "https://langfuse.test/api/public/ingestion"
+    assert request.headers["Authorization"] == "Basic " + base64.b64encode(b"pk:sk").decode()
+    (event,) = json.loads(request.content)["batch"]
+    assert event["type"] == "trace-create"
+    assert event["id"] != event["body"]["id"]
+    assert datetime.fromisoformat(event["timestamp"]).tzinfo is not None
+    assert event["body"]["name"] == "embedding_batch"
+    assert event["body"]["timestamp"] == event["timestamp"]
+    assert event["body"]["metadata"] == {
+        "dataset": settings.langfuse_dataset,
+        "route": "/embed",
+        "count": 3,
+        "duration_ms": 250.0,
+        "model": "e5",
+    }
+
+
+def _batch_sizes(telemetry: TelemetryClient) -> list:
+    return [len(json.loads(r.content)["batch"]) for r in telemetry.sent]
+
+
+async def _drain_sends(telemetry: TelemetryClient) -> None:
+    await asyncio.gather(*list(telemetry._pending))
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_at_max_events(telemetry, monkeypatch):
+    monkeypatch.setattr(settings, "telemetry_flush_max_events", 3)
+
+    for _ in range(2):
+        await _record(telemetry)
+    await asyncio.sleep(0)
+    assert telemetry.sent == []
+
+    await _record(telemetry)
+    await _drain_sends(telemetry)
+    assert _batch_sizes(telemetry) == [3]
+    await telemetry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_after_flush_interval(telemetry, monkeypatch):
+    monkeypatch.setattr(settings, "telemetry_flush_ms", 10.0)
+
+    await _record(telemetry)
+    await _record(telemetry)
+    assert telemetry.sent == []
+
+    await asyncio.sleep(0.05)
+    await _drain_sends(telemetry)
+    assert _batch_sizes(telemetry) == [2]
+    assert telemetry._flush_task is None
+    await telemetry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_drains_buffer_and_closes_client(telemetry):
+    http_client = telemetry._client
+
+    await _record(telemetry)
+    await _record(telemetry)
+    assert telemetry.sent == []
+
+    await telemetry.aclose()
+
+    assert _batch_sizes(telemetry) == [2]
+    assert not telemetry._pending
+    assert http_client.is_closed
+    assert telemetry._client is None
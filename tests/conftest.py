@@ -0,0 +1,27 @@
+"""Shared pytest fixtures."""
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def sigrid_prompt_tree(tmp_path_factory):
+    """assistants_root with one complete and one incomplete sigrid-von-gleich worldview.
+
+    Mathematismus has what/how + instructions; Idealismus only has instructions.
+    Built once per session; tests must treat it as read-only.
+    """
+    root = tmp_path_factory.mktemp("assistants")
+    worldviews = root / "sigrid-von-gleich" / "worldviews"
+
+    math_prompts = worldviews / "Mathematismus" / "prompts"
+    math_prompts.mkdir(parents=True)
+    (math_prompts / "concept-explain-what.prompt").write_text("WHAT {{CONCEPT_EXPLANATION}}", encoding="utf-8")
+    (math_prompts / "concept-explain-how.prompt").write_text("HOW {{MAIN_POINTS}}", encoding="utf-8")
+    (math_prompts / "instructions.prompt").write_text("DESC", encoding="utf-8")
+
+    ideal_prompts = worldviews / "Idealismus" / "prompts"
+    ideal_prompts.mkdir(parents=True)
+    (ideal_prompts / "instructions.md").write_text("DESC", encoding="utf-8")
+
+    return root
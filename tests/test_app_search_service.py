@@ -169,7 +169,7 @@ def test_resolve_quote_paragraph_row_uses_segment_id() -> None:
 
 @pytest.mark.asyncio
 async def test_fix_quote_navigation_overrides_wrong_paragraph_id() -> None:
-    engine = MagicMock()
+    engine = MagicMock(spec=["connect"])
     conn = MagicMock()
     engine.connect.return_value.__enter__.return_value = conn
     conn.execute.return_value.fetchone.return_value = ("book-1:5:27",)
@@ -192,7 +192,7 @@ async def test_fix_quote_navigation_overrides_wrong_paragraph_id() -> None:
 
 @pytest.mark.asyncio
 async def test_fix_quote_navigation_by_text_when_paragraph_meta_missing() -> None:
-    engine = MagicMock()
+    engine = MagicMock(spec=["connect"])
     conn = MagicMock()
     engine.connect.return_value.__enter__.return_value = conn
     conn.execute.return_value.fetchone.return_value = ("book-1:7:91",)
@@ -275,7 +275,7 @@ def test_dedupe_results_by_chunk_id_keeps_highest_score() -> None:
 
 @pytest.mark.asyncio
 async def test_resolve_quote_explanations_swaps_to_parent() -> None:
-    engine = MagicMock()
+    engine = MagicMock(spec=["connect"])
     conn = MagicMock()
     engine.connect.return_value.__enter__.return_value = conn
     conn.execute.return_value.mappings.return_value.all.return_value = [
@@ -311,7 +311,7 @@ async def test_resolve_quote_explanations_swaps_to_parent() -> None:
 
 @pytest.mark.asyncio
 async def test_resolve_quote_explanations_drops_missing_parent() -> None:
-    engine = MagicMock()
+    engine = MagicMock(spec=["connect"])
     conn = MagicMock()
     engine.connect.return_value.__enter__.return_value = conn
     conn.execute.return_value.mappings.return_value.all.return_value = []
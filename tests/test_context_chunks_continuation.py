@@ -22,8 +22,8 @@ def _row(chunk_id: str, source_index: int, segment_id: str = "seg-iv") -> tuple:
 
 @pytest.fixture
 def mock_engine_for_context_chunks(monkeypatch):
-    mock_engine = MagicMock()
-    mock_conn = MagicMock()
+    mock_engine = MagicMock(spec=["connect"])
+    mock_conn = MagicMock(spec=["__enter__", "__exit__", "execute"])
     mock_conn.__enter__ = MagicMock(return_value=mock_conn)
     mock_conn.__exit__ = MagicMock(return_value=None)
 
@@ -31,7 +31,7 @@ def mock_engine_for_context_chunks(monkeypatch):
     candidate_rows: list = []
 
     def make_result(rows):
-        mr = MagicMock()
+        mr = MagicMock(spec=["fetchall"])
         mr.fetchall = MagicMock(return_value=rows)
         return mr
 
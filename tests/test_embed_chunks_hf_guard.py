@@ -4,7 +4,7 @@ from __future__ import annotations
 import pytest
 from fastapi import HTTPException
 
-from app.api.rag import EmbedChunksRequest, _reject_hf_batch_ingest
+from app.api.rag import EmbedChunksRequest, _reject_hf_batch_ingest, _reject_hf_ingest
 from app.config import settings
 
 
@@ -40,3 +40,12 @@ def test_allow_ingest_when_forbid_flag_false(monkeypatch):
     monkeypatch.setattr(settings, "embeddings_hf_forbid_ingest", False)
     request = EmbedChunksRequest(collection_name="philo-von-freisinn")
     _reject_hf_batch_ingest(request)
+
+
+def test_reject_hf_ingest_names_the_route(monkeypatch):
+    monkeypatch.setattr(settings, "embeddings_provider", "hf")
+    monkeypatch.setattr(settings, "embeddings_hf_forbid_ingest", True)
+    with pytest.raises(HTTPException) as exc:
+        _reject_hf_ingest("/rag/upload-chunks-stream")
+    assert exc.value.status_code == 400
+    assert "/rag/upload-chunks-stream" in str(exc.value.detail)
@@ -1,20 +1,24 @@
 """Unit tests for the ingestion service."""
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+import tracemalloc
 from typing import Iterable, List, Sequence
-from uuid import uuid5, NAMESPACE_DNS
+from uuid import UUID, uuid5, NAMESPACE_DNS
 
 import pytest
 
 from app.infra.embedding_client import EmbeddingBatchResult
-from app.ingestion.services.ingestion_service import IngestionService
+from app.ingestion.services import ingestion_service as ingestion_module
+from app.ingestion.services.ingestion_service import IngestionService, derive_point_id
 from app.services.mirror_repository import ChunkMirrorRepository
 from app.shared.models import ChunkRecord
 
 
+_FROZEN_NOW = "2025-01-01T00:00:00"
+
+
 def _chunk_payload(chunk_id: str, content_hash: str) -> dict[str, object]:
-    now = datetime.utcnow().isoformat()
     return {
         "id": chunk_id,
         "text": f"text for {chunk_id}",
@@ -33,8 +37,8 @@ def _chunk_payload(chunk_id: str, content_hash: str) -> dict[str, object]:
             "importance": 5,
             "text": f"text for {chunk_id}",
             "content_hash": content_hash,
-            "created_at": now,
-            "updated_at": now,
+            "created_at": _FROZEN_NOW,
+            "updated_at": _FROZEN_NOW,
             "source_type": "book",
             "language": "de",
             "tags": ["tag"],
@@ -42,14 +46,28 @@ def _chunk_payload(chunk_id: str, content_hash: str) -> dict[str, object]:
     }
 
 
+_BASE_RECORD = ChunkRecord.from_dict(_chunk_payload("base", "base-hash"))
+
+
 def _chunk_record(chunk_id: str, content_hash: str) -> ChunkRecord:
-    return ChunkRecord.from_dict(_chunk_payload(chunk_id, content_hash))
+    """Variant of a once-validated template; validation itself is covered by
+    the _chunk_payload + ChunkRecord.from_dict tests below."""
+    text = f"text for {chunk_id}"
+    metadata = _BASE_RECORD.metadata.model_copy(
+        update={"chunk_id": chunk_id, "content_hash": content_hash, "text": text}
+    )
+    return _BASE_RECORD.model_copy(update={"id": chunk_id, "text": text, "metadata": metadata})
 
 
 class FakeEmbeddingClient:
-    def __init__(self, dimension: int = 4) -> None:
+    def __init__(self, dimension: int = 4, delay: float = 0.0) -> None:
         self.dimension = dimension
+        self.delay = delay
         self.calls: list[dict[str, object]] = []
+        self.intervals: list[tuple[float, float]] = []
+        # Row i is always [i] * dimension; the SUT copies vectors via list(vector),
+        # so rows can be built once and shared across calls.
+        self._rows: list[list[float]] = []
 
     async def embed_texts(
         self,
@@ -59,9 +77,14 @@ class FakeEmbeddingClient:
         batch_size: int | None = None,
     ) -> EmbeddingBatchResult:
         self.calls.append({"texts": list(texts), "model": model_name, "batch_size": batch_size})
-        embeddings = [
-            [float(idx + 1) for _ in range(self.dimension)] for idx, _ in enumerate(texts)
-        ]
+        if self.delay:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.sleep(self.delay)
+            self.intervals.append((start, loop.time()))
+        for idx in range(len(self._rows) + 1, len(texts) + 1):
+            self._rows.append([float(idx)] * self.dimension)
+        embeddings = self._rows[: len(texts)]
         return EmbeddingBatchResult(
             embeddings=embeddings,
             dimensions=self.dimension,
@@ -70,7 +93,9 @@ class FakeEmbeddingClient:
 
 
 class FakeQdrantClient:
-    def __init__(self) -> None:
+    def __init__(self, capture_points: bool = False) -> None:
+        # Upserts record count and first/last id; full point lists only on request.
+        self.capture_points = capture_points
         self.ensure_calls: list[dict[str, object]] = []
         self.upserts: list[dict[str, object]] = []
         self.deletes: list[dict[str, object]] = []
@@ -100,7 +125,17 @@ class FakeQdrantClient:
         *,
         wait: bool = True,
     ) -> None:
-        self.upserts.append({"collection": collection, "points": list(points), "wait": wait})
+        pts = points if isinstance(points, list) else list(points)
+        record: dict[str, object] = {
+            "collection": collection,
+            "count": len(pts),
+            "first_id": pts[0]["id"] if pts else None,
+            "last_id": pts[-1]["id"] if pts else None,
+            "wait": wait,
+        }
+        if self.capture_points:
+            record["points"] = list(pts)
+        self.upserts.append(record)
 
     async def delete_points(
         self,
@@ -162,6 +197,18 @@ class FakeQdrantClient:
         # Default: no existing points for cleanup
         return []
 
+    async def scroll_points_iter(
+        self,
+        collection: str,
+        *,
+        limit: int = 256,
+        **kwargs: object,
+    ):
+        # Pages over scroll_all_points so tests can keep overriding that one method.
+        points = await self.scroll_all_points(collection, limit=limit, **kwargs)
+        for start in range(0, len(points), limit):
+            yield points[start : start + limit]
+
 
 class FakeMirror(ChunkMirrorRepository):
     def __init__(self) -> None:
@@ -220,13 +267,151 @@ async def test_upload_chunks_dedupes_and_upserts():
     assert result.embedding_model == "custom-model"
     assert result.vector_size == embedding_client.dimension
 
+    # Unique chunks are embedded in batch_size windows, never one call per chunk.
+    assert len(embedding_client.calls) == 1
+    assert all(
+        isinstance(c["texts"], list) and len(c["texts"]) <= 2 for c in embedding_client.calls
+    )
+    assert sum(len(c["texts"]) for c in embedding_client.calls) == 2
+
     assert qdrant_client.ensure_calls == [{"name": "books", "vector_size": embedding_client.dimension}]
     assert len(qdrant_client.upserts) == 1
-    assert len(qdrant_client.upserts[0]["points"]) == 2
+    assert qdrant_client.upserts[0]["count"] == 2
     assert mirror.upserts and len(mirror.upserts[0]["chunks"]) == 2
     assert telemetry.calls and telemetry.calls[0]["collection"] == "books"
 
 
+@pytest.mark.asyncio
+async def test_upload_chunks_embeds_batches_concurrently():
+    service, embedding_client, qdrant_client, _mirror, _telemetry = _service()
+    embedding_client.delay = 0.05
+    chunks = [_chunk_record(f"chunk-{i}", f"hash-{i}") for i in range(20)]
+
+    await service.upload_chunks(collection="books", chunks=chunks, batch_size=2)
+
+    assert len(embedding_client.calls) == 10
+    assert [t for c in embedding_client.calls for t in c["texts"]] == [
+        f"text for chunk-{i}" for i in range(20)
+    ]
+    # Interval sweep: peak number of embed calls in flight at once.
+    events = sorted(
+        [(start, 1) for start, _ in embedding_client.intervals]
+        + [(end, -1) for _, end in embedding_client.intervals]
+    )
+    in_flight = peak = 0
+    for _, delta in events:
+        in_flight += delta
+        peak = max(peak, in_flight)
+    assert 2 <= peak <= service.embed_concurrency
+    assert sum(u["count"] for u in qdrant_client.upserts) == 20
+
+
+@pytest.mark.asyncio
+async def test_upload_chunks_windows_texts_by_length():
+    service, embedding_client, _qdrant, _mirror, _telemetry = _service(dimension=2)
+    qdrant_client = FakeQdrantClient(capture_points=True)
+    service.qdrant_client = qdrant_client
+    embedding_client.delay = 0.01
+    suffix_lengths = [7, 1, 12, 3, 9, 2, 15, 5, 4, 11, 6, 8]
+    chunks = [_chunk_record("c" + "x" * n, f"hash-{n}") for n in suffix_lengths]
+    lengths_by_call: list[list[int]] = []
+    original_embed = embedding_client.embed_texts
+
+    async def embed_by_length(texts, **kwargs):
+        lengths_by_call.append([len(t) for t in texts])
+        result = await original_embed(texts, **kwargs)
+        result.embeddings = [[float(len(t))] * 2 for t in texts]
+        return result
+
+    embedding_client.embed_texts = embed_by_length
+
+    await service.upload_chunks(collection="books", chunks=chunks, batch_size=3)
+
+    # Windows hold neighbouring lengths: every window ends no longer than the next begins.
+    windows = sorted(lengths_by_call)
+    assert all(w == sorted(w) for w in lengths_by_call)
+    assert all(a[-1] <= b[0] for a, b in zip(windows, windows[1:]))
+    peak = max(
+        sum(1 for s2, e2 in embedding_client.intervals if s2 <= start < e2)
+        for start, _ in embedding_client.intervals
+    )
+    assert peak <= service.embed_concurrency
+    # Vectors are reassembled onto the right chunks despite the reordering.
+    points = [p for u in qdrant_client.upserts for p in u["points"]]
+    assert [p["vector"][0] for p in points] == [
+        float(len(p["payload"]["text"])) for p in points
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_chunks_rejects_short_embedding_window():
+    service, embedding_client, qdrant_client, mirror, _telemetry = _service()
+    chunks = [_chunk_record(f"chunk-{i}", f"hash-{i}") for i in range(6)]
+    original_embed = embedding_client.embed_texts
+
+    async def embed_short_first_window(texts, **kwargs):
+        result = await original_embed(texts, **kwargs)
+        if len(embedding_client.calls) == 1:
+            result.embeddings = result.embeddings[:-1]
+        return result
+
+    embedding_client.embed_texts = embed_short_first_window
+
+    with pytest.raises(RuntimeError, match="window size"):
+        await service.upload_chunks(collection="books", chunks=chunks, batch_size=2)
+
+    assert qdrant_client.upserts == []
+    assert mirror.upserts == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("count", "bulk_mode", "expect_bulk"),
+    [(1200, None, True), (10, None, False), (10, True, True)],
+    ids=["auto-bulk", "auto-small", "forced-bulk"],
+)
+async def test_upload_chunks_bulk_mode_skips_upsert_acks(count, bulk_mode, expect_bulk):
+    service, _embedding_client, qdrant_client, _mirror, _telemetry = _service()
+    chunks = [_chunk_record(f"chunk-{i}", f"hash-{i}") for i in range(count)]
+
+    await service.upload_chunks(
+        collection="books", chunks=chunks, batch_size=4, bulk_mode=bulk_mode
+    )
+
+    waits = [u["wait"] for u in qdrant_client.upserts]
+    assert sum(u["count"] for u in qdrant_client.upserts) == count
+    # The final upsert always waits so the upload is applied on return.
+    assert waits[-1] is True
+    assert all(w is (not expect_bulk) for w in waits[:-1])
+
+
+@pytest.mark.parametrize("size", [50, 2500])
+def test_dedupe_chunks_scales_linearly_with_duplicates(size):
+    service, *_ = _service()
+    reads = 0
+
+    class CountingChunk:
+        """Counts metadata reads: a pairwise scan reads O(n^2) times, set lookups O(n)."""
+
+        def __init__(self, chunk: ChunkRecord) -> None:
+            self.chunk = chunk
+
+        @property
+        def metadata(self):
+            nonlocal reads
+            reads += 1
+            return self.chunk.metadata
+
+    unique = [CountingChunk(_chunk_record(f"chunk-{i}", f"hash-{i}")) for i in range(size)]
+    chunks = [c for pair in zip(unique, unique) for c in pair]
+
+    deduped, duplicates = service._dedupe_chunks(chunks)
+
+    assert duplicates == size
+    assert deduped == unique
+    assert reads <= 2 * len(chunks)
+
+
 @pytest.mark.asyncio
 async def test_upload_raises_when_no_chunks_provided():
     service, *_ = _service()
@@ -245,14 +430,37 @@ async def test_delete_chunks_invokes_backends():
         chunk_ids=chunk_ids,
     )
 
-    # Qdrant receives UUIDs (converted from chunk_ids)
-    expected_uuids = [str(uuid5(NAMESPACE_DNS, cid)) for cid in chunk_ids]
+    # Qdrant receives point ids derived from chunk_ids
+    expected_uuids = [derive_point_id(cid) for cid in chunk_ids]
+    assert all(str(UUID(pid)) == pid for pid in expected_uuids)
 
     assert result.deleted == 3
     assert qdrant_client.deletes[0]["ids"] == expected_uuids
     assert mirror.deletes[0]["chunk_ids"] == chunk_ids
 
 
+@pytest.mark.asyncio
+async def test_delete_chunks_reuses_cached_point_ids(monkeypatch):
+    calls: list[str] = []
+
+    def counting_uuid5(namespace, name):
+        calls.append(name)
+        return uuid5(namespace, name)
+
+    monkeypatch.setattr(ingestion_module, "uuid5", counting_uuid5)
+    ingestion_module.derive_point_id.cache_clear()
+    service, _, qdrant_client, _, _ = _service()
+
+    await service.delete_chunks(collection="books", chunk_ids=["a", "b", "c"])
+    await service.delete_chunks(collection="books", chunk_ids=["b", "c", "d"])
+    ingestion_module.derive_point_id.cache_clear()
+
+    assert sorted(calls) == ["a", "b", "c", "d"]
+    assert qdrant_client.deletes[1]["ids"] == [
+        str(uuid5(NAMESPACE_DNS, cid)) for cid in ["b", "c", "d"]
+    ]
+
+
 def test_chunk_record_rejects_legacy_worldview_field():
     payload = _chunk_payload("legacy-worldview", "hash-legacy")
     payload["metadata"].pop("worldviews", None)
@@ -403,6 +611,50 @@ async def test_cleanup_stale_deletes_all_when_active_set_empty():
     assert set(mirror.deletes[0]["chunk_ids"]) == {"orphan-1", "orphan-2"}
 
 
+@pytest.mark.asyncio
+async def test_cleanup_stale_deletes_page_by_page_in_bounded_memory():
+    service, _, qdrant_client, mirror, _ = _service()
+    pages, page_size = 200, 512
+    # One stale id per page; everything else is active.
+    active = {
+        f"chunk-{p}-{i}" for p in range(pages) for i in range(1, page_size)
+    }
+    deleted: list[int] = []
+
+    async def scroll_points_iter(collection, **kwargs):
+        for p in range(pages):
+            yield [
+                {"id": f"point-{p}-{i}", "payload": {"chunk_id": f"chunk-{p}-{i}"}}
+                for i in range(page_size)
+            ]
+
+    async def delete_points(collection, point_ids, *, wait=True):
+        deleted.append(len(point_ids))
+
+    async def delete_chunks(collection, chunk_ids):
+        return None
+
+    qdrant_client.scroll_points_iter = scroll_points_iter  # type: ignore[method-assign]
+    qdrant_client.delete_points = delete_points  # type: ignore[method-assign]
+    mirror.delete_chunks = delete_chunks  # type: ignore[method-assign]
+
+    tracemalloc.start()
+    try:
+        _, stale_deleted = await service._cleanup_stale(
+            "books",
+            [_chunk_record("chunk-0-1", "hash")],
+            active_ids_by_source_type={("source-1", "book"): active},
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stale_deleted == pages
+    assert deleted == [1] * pages
+    # ~100k points in total; holding them all at once would need tens of MB.
+    assert peak < 10_000_000
+
+
 @pytest.mark.asyncio
 async def test_upload_chunks_updates_payload_when_parent_id_changes():
     service, embedding_client, qdrant_client, mirror, _ = _service()
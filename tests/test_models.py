@@ -1,13 +1,15 @@
 """Tests for core ragrun domain models."""
-from datetime import datetime
 
 import pytest
 
 from app.shared.models import CHUNK_TYPE_ENUM, ChunkMetadata, ChunkRecord
 
+_FROZEN_NOW = "2025-01-01T00:00:00"
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def base_metadata_dict():
+    """Shared template; from_payload mutates its input, so tests pass copies."""
     return {
         "author": "Immanuel Hermann Fichte",
         "source_id": "philo-book1",
@@ -23,8 +25,8 @@ def base_metadata_dict():
         "importance": 5,
         "text": "Example chunk text",
         "content_hash": "sha256:abc",
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat(),
+        "created_at": _FROZEN_NOW,
+        "updated_at": _FROZEN_NOW,
         "source_type": "book",
         "language": "de",
         "tags": ["philosophy", "typology"],
@@ -32,23 +34,39 @@ def base_metadata_dict():
 
 
 def test_chunk_metadata_valid(base_metadata_dict):
-    metadata = ChunkMetadata.from_payload(base_metadata_dict)
+    metadata = ChunkMetadata.from_payload({**base_metadata_dict})
     assert metadata.chunk_type == "book"
     assert metadata.chunk_id == base_metadata_dict["chunk_id"]
 
 
-@pytest.mark.parametrize("missing_field", ["source_id", "chunk_id", "content_hash", "language"])
-def test_chunk_metadata_required_fields(missing_field, base_metadata_dict):
-    payload = base_metadata_dict.copy()
-    payload.pop(missing_field)
-    with pytest.raises(Exception):
-        ChunkMetadata.from_payload(payload)
-
-
-@pytest.mark.parametrize("invalid_chunk_type", ["invalid", "Book", "chapter"])
-def test_chunk_metadata_chunk_type_enum(invalid_chunk_type, base_metadata_dict):
-    payload = base_metadata_dict.copy()
-    payload["chunk_type"] = invalid_chunk_type
+_MISSING = object()
+
+
+@pytest.mark.parametrize(
+    ("bad_field", "bad_value"),
+    [
+        ("source_id", _MISSING),
+        ("chunk_id", _MISSING),
+        ("content_hash", _MISSING),
+        ("language", _MISSING),
+        ("chunk_type", "invalid"),
+        ("chunk_type", "Book"),
+        ("chunk_type", "chapter"),
+    ],
+    ids=[
+        "missing-source_id",
+        "missing-chunk_id",
+        "missing-content_hash",
+        "missing-language",
+        "chunk_type-invalid",
+        "chunk_type-Book",
+        "chunk_type-chapter",
+    ],
+)
+def test_chunk_metadata_rejects_invalid_payload(bad_field, bad_value, base_metadata_dict):
+    payload = {**base_metadata_dict, bad_field: bad_value}
+    if bad_value is _MISSING:
+        del payload[bad_field]
     with pytest.raises(ValueError):
         ChunkMetadata.from_payload(payload)
 
@@ -57,7 +75,7 @@ def test_chunk_record_infers_id_from_metadata(base_metadata_dict):
     chunk_dict = {
         "id": None,
         "text": "Hello",
-        "metadata": base_metadata_dict,
+        "metadata": {**base_metadata_dict},
         "embedding": [0.1, 0.2],
     }
     record = ChunkRecord.from_dict(chunk_dict)
@@ -1,23 +1,31 @@
 """API tests for ragprep-compatible RAG endpoints."""
 from __future__ import annotations
 
-import json
-from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+import time
+from functools import lru_cache
 
 from app.shared.models import ChunkRecord
 
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
 
 from app.api import rag as rag_router
+from app.db.tables import metadata
 from app.main import app
 from app.services.ingestion_service import DeleteResult, UploadResult
 
 
+_FROZEN_NOW = "2025-01-01T00:00:00"
+
+
+@lru_cache(maxsize=None)
 def _sample_chunk_jsonl(chunk_id: str, content_hash: str) -> str:
     """Generate a single JSONL line for testing."""
-    now = datetime.utcnow().isoformat()
     chunk = {
         "id": chunk_id,
         "text": f"Sample text for {chunk_id}",
@@ -27,11 +35,11 @@ def _sample_chunk_jsonl(chunk_id: str, content_hash: str) -> str:
             "content_hash": content_hash,
             "chunk_type": "book",
             "language": "en",
-            "created_at": now,
-            "updated_at": now,
+            "created_at": _FROZEN_NOW,
+            "updated_at": _FROZEN_NOW,
         },
     }
-    return json.dumps(chunk)
+    return orjson.dumps(chunk).decode()
 
 
 class StubIngestionService:
@@ -54,6 +62,7 @@ class StubIngestionService:
             vector_size=768,
             unchanged=0,
             changed=requested,
+            payload_changed=0,
             new=0,
             stale_deleted=0,
         )
@@ -147,41 +156,74 @@ class StubRagChunksRepository:
         return None
 
 
-@pytest.fixture
-def client_with_stub(monkeypatch):
+@compiles(ARRAY, "sqlite")
+def _compile_array_as_json_on_sqlite(type_, compiler, **kw):
+    """Let the TEXT[] worldviews columns be created on the test SQLite engine."""
+    return "JSON"
+
+
+@pytest.fixture(scope="session")
+def sqlite_engine():
+    """One in-memory SQLite database with the full schema, shared by every test.
+
+    StaticPool keeps the single connection alive (and the data with it) across
+    the threads the endpoints run queries on. Tests only read, so it stays empty.
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def _asgi_transport():
+    """In-process ASGI transport shared by all tests; per-test state lives in overrides."""
+    return httpx.ASGITransport(app=app)
+
+
+@pytest_asyncio.fixture
+async def client_with_stub(monkeypatch, _asgi_transport, sqlite_engine):
     """Test client with overridden ingestion service."""
     stub = StubIngestionService()
     rag_stub = StubRagChunksRepository()
 
-    # Mock get_engine to avoid DB connections
-    mock_engine = MagicMock()
-    mock_conn = MagicMock()
-    mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-    mock_conn.__exit__ = MagicMock(return_value=None)
-    mock_result = MagicMock()
-    mock_result.fetchall = MagicMock(return_value=[])
-    mock_result.scalar = MagicMock(return_value=0)
-    mock_conn.execute = MagicMock(return_value=mock_result)
-    mock_engine.connect = MagicMock(return_value=mock_conn)
-
-    def mock_get_engine():
-        return mock_engine
-
-    # Patch at the module level where it's imported
-    monkeypatch.setattr("app.api.rag.get_engine", mock_get_engine)
+    # Patch at the module level where it's imported; avoids DB connections
+    monkeypatch.setattr("app.api.rag.get_engine", lambda: sqlite_engine)
     monkeypatch.setattr("app.api.rag.get_rag_chunks_repository", lambda: rag_stub)
 
     app.dependency_overrides[rag_router.get_ingestion_service] = lambda: stub
-    client = TestClient(app)
 
-    yield client, stub, rag_stub
+    async with httpx.AsyncClient(transport=_asgi_transport, base_url="http://test") as client:
+        yield client, stub, rag_stub
 
     # Cleanup
     app.dependency_overrides.pop(rag_router.get_ingestion_service, None)
 
 
-def test_store_endpoint_persists_chunks(client_with_stub):
-    """Verify store-chunks accepts JSONL and upserts rag_chunks."""
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("skip_deprecate_orphans", "expected_deprecate_calls", "expected_by_source"),
+    [
+        (
+            False,
+            [("test-collection", {"test-source": ["test-001", "test-002"]})],
+            {"test-source": 0},
+        ),
+        (True, [], {}),
+    ],
+    ids=["deprecates-orphans", "skip-deprecate"],
+)
+async def test_store_endpoint_persists_chunks(
+    client_with_stub,
+    skip_deprecate_orphans,
+    expected_deprecate_calls,
+    expected_by_source,
+):
+    """store-chunks upserts rag_chunks; orphan deprecation honours skip_deprecate_orphans."""
     client, _stub, rag_stub = client_with_stub
 
     lines = [
@@ -193,49 +235,28 @@ def test_store_endpoint_persists_chunks(client_with_stub):
     payload = {
         "chunks_jsonl_content": jsonl_content,
         "collection_name": "test-collection",
+        "skip_deprecate_orphans": skip_deprecate_orphans,
     }
 
-    response = client.post("/api/v1/rag/store-chunks", json=payload)
+    response = await client.post("/api/v1/rag/store-chunks", json=payload)
 
     assert response.status_code == 202
     body = response.json()
     assert body["collection"] == "test-collection"
     assert body["stored"] == 2
     assert body["deprecated"] == 0
-    assert body["deprecated_by_source"] == {"test-source": 0}
+    assert body["deprecated_by_source"] == expected_by_source
     assert rag_stub.upsert_calls[0]["rag_partition"] == "test-collection"
     assert len(rag_stub.upsert_calls[0]["chunks"]) == 2
-    assert rag_stub.deprecate_orphans_calls[0][0] == "test-collection"
-    assert rag_stub.deprecate_orphans_calls[0][1] == {
-        "test-source": ["test-001", "test-002"],
-    }
+    assert rag_stub.deprecate_orphans_calls == expected_deprecate_calls
 
 
-def test_store_endpoint_skips_deprecate_when_requested(client_with_stub):
-    """skip_deprecate_orphans=true must not call deprecate_orphans_for_sources."""
-    client, _stub, rag_stub = client_with_stub
-
-    payload = {
-        "chunks_jsonl_content": _sample_chunk_jsonl("test-001", "hash1"),
-        "collection_name": "test-collection",
-        "skip_deprecate_orphans": True,
-    }
-
-    response = client.post("/api/v1/rag/store-chunks", json=payload)
-
-    assert response.status_code == 202
-    body = response.json()
-    assert body["stored"] == 1
-    assert body["deprecated"] == 0
-    assert body["deprecated_by_source"] == {}
-    assert len(rag_stub.deprecate_orphans_calls) == 0
-
-
-def test_deprecate_chunk_ids_endpoint(client_with_stub):
+@pytest.mark.asyncio
+async def test_deprecate_chunk_ids_endpoint(client_with_stub):
     """deprecate-chunk-ids marks explicit chunk_ids via repository."""
     client, _stub, rag_stub = client_with_stub
 
-    response = client.post(
+    response = await client.post(
         "/api/v1/rag/deprecate-chunk-ids",
         json={
             "collection_name": "test-collection",
@@ -252,11 +273,12 @@ def test_deprecate_chunk_ids_endpoint(client_with_stub):
     ]
 
 
-def test_embed_endpoint_runs_ingestion(client_with_stub):
+@pytest.mark.asyncio
+async def test_embed_endpoint_runs_ingestion(client_with_stub):
     """Verify embed-chunks loads rag_chunks and calls ingestion + mark_embedded."""
     client, stub, rag_stub = client_with_stub
     rag_stub.list_records = [
-        ChunkRecord.from_dict(json.loads(_sample_chunk_jsonl("test-001", "hash1"))),
+        ChunkRecord.from_dict(orjson.loads(_sample_chunk_jsonl("test-001", "hash1"))),
     ]
 
     payload = {
@@ -264,7 +286,7 @@ def test_embed_endpoint_runs_ingestion(client_with_stub):
         "skip_cleanup": True,
     }
 
-    response = client.post("/api/v1/rag/embed-chunks", json=payload)
+    response = await client.post("/api/v1/rag/embed-chunks", json=payload)
     assert response.status_code == 202
     body = response.json()
     assert body["text_kb"] > 0
@@ -280,11 +302,12 @@ def test_embed_endpoint_runs_ingestion(client_with_stub):
     }
 
 
-def test_embed_endpoint_passes_shared_source_ids_whitelist(client_with_stub):
+@pytest.mark.asyncio
+async def test_embed_endpoint_passes_shared_source_ids_whitelist(client_with_stub):
     """embed-chunks forwards shared_source_ids to the repository."""
     client, stub, rag_stub = client_with_stub
     rag_stub.list_records = [
-        ChunkRecord.from_dict(json.loads(_sample_chunk_jsonl("test-001", "hash1"))),
+        ChunkRecord.from_dict(orjson.loads(_sample_chunk_jsonl("test-001", "hash1"))),
     ]
 
     payload = {
@@ -293,7 +316,7 @@ def test_embed_endpoint_passes_shared_source_ids_whitelist(client_with_stub):
         "shared_source_ids": ["book-a", "lecture:xyz"],
     }
 
-    response = client.post("/api/v1/rag/embed-chunks", json=payload)
+    response = await client.post("/api/v1/rag/embed-chunks", json=payload)
     assert response.status_code == 202
     assert rag_stub.last_embed_kwargs == {
         "collection": "test-collection",
@@ -303,7 +326,8 @@ def test_embed_endpoint_passes_shared_source_ids_whitelist(client_with_stub):
     }
 
 
-def test_embed_endpoint_rejects_invalid_chunk_type(client_with_stub):
+@pytest.mark.asyncio
+async def test_embed_endpoint_rejects_invalid_chunk_type(client_with_stub):
     """embed-chunks validates chunk_types against CHUNK_TYPE_ENUM."""
     client, _, _ = client_with_stub
     payload = {
@@ -311,20 +335,21 @@ def test_embed_endpoint_rejects_invalid_chunk_type(client_with_stub):
         "skip_cleanup": True,
         "chunk_types": ["not_a_real_type"],
     }
-    response = client.post("/api/v1/rag/embed-chunks", json=payload)
+    response = await client.post("/api/v1/rag/embed-chunks", json=payload)
     assert response.status_code == 400
     assert "Invalid chunk_type" in response.json()["detail"]
 
 
-def test_embed_chunks_stats_endpoint(client_with_stub):
+@pytest.mark.asyncio
+async def test_embed_chunks_stats_endpoint(client_with_stub):
     """embed-chunks/stats returns aggregate count and text size."""
     client, _, rag_stub = client_with_stub
     rag_stub.list_records = [
-        ChunkRecord.from_dict(json.loads(_sample_chunk_jsonl("test-001", "hash1"))),
-        ChunkRecord.from_dict(json.loads(_sample_chunk_jsonl("test-002", "hash2"))),
+        ChunkRecord.from_dict(orjson.loads(_sample_chunk_jsonl("test-001", "hash1"))),
+        ChunkRecord.from_dict(orjson.loads(_sample_chunk_jsonl("test-002", "hash2"))),
     ]
 
-    response = client.post(
+    response = await client.post(
         "/api/v1/rag/embed-chunks/stats",
         json={"collection_name": "test-collection"},
     )
@@ -334,21 +359,114 @@ def test_embed_chunks_stats_endpoint(client_with_stub):
     assert body["text_kb"] > 0
 
 
-def test_store_endpoint_validates_jsonl(client_with_stub):
-    """Verify store-chunks rejects malformed JSONL."""
-    client, _, _ = client_with_stub
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("jsonl_content", "bad_line"),
+    [
+        ("not valid json\n{also bad", 1),
+        (_sample_chunk_jsonl("test-001", "hash1") + "\n{also bad", 2),
+        ('{"id": "x", "text": "no metadata"}', 1),
+        (
+            _sample_chunk_jsonl("test-001", "hash1").replace('"book"', '"chapter"'),
+            1,
+        ),
+    ],
+    ids=["malformed-json", "malformed-second-line", "missing-metadata", "invalid-chunk_type"],
+)
+async def test_store_endpoint_validates_jsonl(client_with_stub, jsonl_content, bad_line):
+    """Verify store-chunks rejects invalid JSONL and reports the offending line."""
+    client, _, rag_stub = client_with_stub
 
     payload = {
-        "chunks_jsonl_content": "not valid json\n{also bad",
+        "chunks_jsonl_content": jsonl_content,
         "collection_name": "test-collection",
     }
 
-    response = client.post("/api/v1/rag/store-chunks", json=payload)
+    response = await client.post("/api/v1/rag/store-chunks", json=payload)
+    assert response.status_code == 400
+    assert f"Invalid JSONL at line {bad_line}" in response.json()["detail"]
+    assert rag_stub.upsert_calls == []
+
+
+@pytest.mark.asyncio
+async def test_store_endpoint_parses_large_jsonl_quickly(client_with_stub):
+    """Perf guard: a 10k-line upload is parsed in one pass well under the budget."""
+    client, _, rag_stub = client_with_stub
+    jsonl_content = "\n".join(
+        _sample_chunk_jsonl(f"test-{i:05d}", f"hash{i}") for i in range(10_000)
+    )
+
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/v1/rag/store-chunks",
+        json={
+            "chunks_jsonl_content": jsonl_content,
+            "collection_name": "test-collection",
+            "skip_deprecate_orphans": True,
+        },
+    )
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 202
+    assert response.json()["stored"] == 10_000
+    assert len(rag_stub.upsert_calls[0]["chunks"]) == 10_000
+    # Soft threshold: generous enough for slow CI, tight enough to catch a
+    # quadratic or per-line-overhead regression.
+    assert elapsed < 10.0
+
+
+@pytest.mark.asyncio
+async def test_upload_chunks_stream_stores_windows_then_embeds_from_rag_chunks(client_with_stub):
+    """upload-chunks-stream parses JSONL split at arbitrary byte boundaries into rag_chunks."""
+    client, stub, rag_stub = client_with_stub
+    body = "\n".join(
+        _sample_chunk_jsonl(f"test-{i:05d}", f"hash{i}") for i in range(1_200)
+    ).encode()
+    rag_stub.list_records = [
+        ChunkRecord.from_dict(orjson.loads(_sample_chunk_jsonl("test-00000", "hash0"))),
+    ]
+
+    async def pieces():
+        # Odd piece size so most lines straddle two reads.
+        for start in range(0, len(body), 997):
+            yield body[start : start + 997]
+
+    response = await client.post(
+        "/api/v1/rag/upload-chunks-stream",
+        params={"collection_name": "test-collection"},
+        content=pieces(),
+    )
+
+    assert response.status_code == 202
+    assert [len(c["chunks"]) for c in rag_stub.upsert_calls] == [512, 512, 176]
+    assert {c["rag_partition"] for c in rag_stub.upsert_calls} == {"test-collection"}
+    stored = [chunk.metadata.chunk_id for c in rag_stub.upsert_calls for chunk in c["chunks"]]
+    assert stored == [f"test-{i:05d}" for i in range(1_200)]
+    # Embedding reads back from rag_chunks, scoped to the streamed sources only.
+    assert rag_stub.last_embed_kwargs["source_ids"] == ["test-source"]
+    assert rag_stub.last_embed_kwargs["shared_source_ids"] == []
+    assert stub.upload_calls[0]["chunks"] == rag_stub.list_records
+    assert rag_stub.mark_embedded_calls == [("test-collection", ["test-00000"])]
+
+
+@pytest.mark.asyncio
+async def test_upload_chunks_stream_reports_bad_line(client_with_stub):
+    client, stub, _ = client_with_stub
+    body = "\n".join([_sample_chunk_jsonl("test-001", "hash1"), "{not json"]).encode()
+
+    response = await client.post(
+        "/api/v1/rag/upload-chunks-stream",
+        params={"collection_name": "test-collection"},
+        content=body,
+    )
+
     assert response.status_code == 400
-    assert "Invalid JSONL" in response.json()["detail"]
+    assert "Invalid JSONL at line 2" in response.json()["detail"]
+    assert stub.upload_calls == []
 
 
-def test_delete_endpoint_requires_filter_or_all(client_with_stub):
+@pytest.mark.asyncio
+async def test_delete_endpoint_requires_filter_or_all(client_with_stub):
     """Verify delete-chunks requires either filter or all=true."""
     client, _, _ = client_with_stub
     
@@ -357,12 +475,13 @@ def test_delete_endpoint_requires_filter_or_all(client_with_stub):
         # Missing both 'all' and 'filter'
     }
 
-    response = client.post("/api/v1/rag/delete-chunks", json=payload)
+    response = await client.post("/api/v1/rag/delete-chunks", json=payload)
     assert response.status_code == 400
     assert "all=true" in response.json()["detail"] or "filter" in response.json()["detail"]
 
 
-def test_delete_endpoint_dry_run(client_with_stub):
+@pytest.mark.asyncio
+async def test_delete_endpoint_dry_run(client_with_stub):
     """Verify delete-chunks dry_run returns matched count."""
     client, _, _ = client_with_stub
     
@@ -372,7 +491,7 @@ def test_delete_endpoint_dry_run(client_with_stub):
         "dry_run": True,
     }
 
-    response = client.post("/api/v1/rag/delete-chunks", json=payload)
+    response = await client.post("/api/v1/rag/delete-chunks", json=payload)
     
     assert response.status_code == 200
     data = response.json()
@@ -381,7 +500,8 @@ def test_delete_endpoint_dry_run(client_with_stub):
     assert data["deleted"] == 0
 
 
-def test_list_chunks_returns_inventory(monkeypatch):
+@pytest.mark.asyncio
+async def test_list_chunks_returns_inventory(monkeypatch, _asgi_transport):
     """Verify list-chunks inventories from Qdrant scroll (independent of mirror)."""
 
     class FakeQdrant:
@@ -421,11 +541,11 @@ def test_list_chunks_returns_inventory(monkeypatch):
 
     monkeypatch.setattr("app.api.rag.QdrantClient", FakeQdrant)
 
-    client = TestClient(app)
-    res = client.post(
-        "/api/v1/rag/list-chunks",
-        json={"collection_name": "test-collection", "source_id": "test-source", "limit": 10},
-    )
+    async with httpx.AsyncClient(transport=_asgi_transport, base_url="http://test") as client:
+        res = await client.post(
+            "/api/v1/rag/list-chunks",
+            json={"collection_name": "test-collection", "source_id": "test-source", "limit": 10},
+        )
     assert res.status_code == 200
     body = res.json()
     assert body["collection"] == "test-collection"
@@ -435,12 +555,13 @@ def test_list_chunks_returns_inventory(monkeypatch):
     assert body["chunks"][0]["chunk_type"] == "book"
 
 
-def test_delete_chunk_ids_dry_run_and_limit(client_with_stub):
+@pytest.mark.asyncio
+async def test_delete_chunk_ids_dry_run_and_limit(client_with_stub):
     """Verify delete-chunk-ids enforces limit and supports dry_run."""
     client, stub, _ = client_with_stub
 
     # limit enforcement happens even on dry_run
-    res = client.post(
+    res = await client.post(
         "/api/v1/rag/delete-chunk-ids",
         json={
             "collection_name": "test-collection",
@@ -451,7 +572,7 @@ def test_delete_chunk_ids_dry_run_and_limit(client_with_stub):
     )
     assert res.status_code == 400
 
-    res2 = client.post(
+    res2 = await client.post(
         "/api/v1/rag/delete-chunk-ids",
         json={
             "collection_name": "test-collection",
@@ -4,8 +4,10 @@ import pytest
 from fastapi import HTTPException
 
 from app.config import settings
-from app.retrieval.graphs.translate_to_worldview import run_translate_to_worldview_graph
-from app.retrieval.prompts import sigrid_von_gleich_worldviews as sigrid_prompts
+from app.retrieval.graphs.translate_to_worldview import (
+    _validate_prompt_files,
+    run_translate_to_worldview_graph,
+)
 from app.retrieval.api.translate_to_worldview import _validate_worldviews
 
 
@@ -14,31 +16,11 @@ class _Dummy:
 
 
 @pytest.mark.asyncio
-async def test_translate_to_worldview_fails_fast_on_missing_prompt_files(tmp_path, monkeypatch):
-    # Point assistants_root to a temp directory so the test is hermetic.
-    assistants_root = tmp_path / "assistants"
-    monkeypatch.setattr(settings, "assistants_root", str(assistants_root))
-
-    # Clear prompt caches (they are keyed by worldview/filename, not root).
-    sigrid_prompts._load_prompt_file.cache_clear()  # type: ignore[attr-defined]
-    sigrid_prompts._load_worldview_description.cache_clear()  # type: ignore[attr-defined]
-
-    # Create one complete worldview, and one incomplete.
-    # Complete: Mathematismus (what/how + instructions)
-    math_prompts = (
-        assistants_root / "sigrid-von-gleich" / "worldviews" / "Mathematismus" / "prompts"
-    )
-    math_prompts.mkdir(parents=True)
-    (math_prompts / "concept-explain-what.prompt").write_text("WHAT {{CONCEPT_EXPLANATION}}", encoding="utf-8")
-    (math_prompts / "concept-explain-how.prompt").write_text("HOW {{MAIN_POINTS}}", encoding="utf-8")
-    (math_prompts / "instructions.prompt").write_text("DESC", encoding="utf-8")
-
-    # Incomplete: Idealismus (missing what/how)
-    ideal_prompts = (
-        assistants_root / "sigrid-von-gleich" / "worldviews" / "Idealismus" / "prompts"
-    )
-    ideal_prompts.mkdir(parents=True)
-    (ideal_prompts / "instructions.md").write_text("DESC", encoding="utf-8")
+async def test_translate_to_worldview_fails_fast_on_missing_prompt_files(
+    sigrid_prompt_tree, monkeypatch
+):
+    # Mathematismus is complete, Idealismus lacks what/how (see conftest).
+    monkeypatch.setattr(settings, "assistants_root", str(sigrid_prompt_tree))
 
     with pytest.raises(ValueError) as exc:
         await run_translate_to_worldview_graph(
@@ -54,9 +36,55 @@ async def test_translate_to_worldview_fails_fast_on_missing_prompt_files(tmp_pat
     assert "Missing sigrid-von-gleich worldview prompt(s)" in str(exc.value)
 
 
-def test_translate_to_worldview_validates_allowed_worldviews():
-    with pytest.raises(HTTPException) as exc:
-        _validate_worldviews(["NotAWorldview"])
-    assert exc.value.status_code == 400
-    assert "Unknown worldview" in str(exc.value.detail)
+@pytest.mark.parametrize(
+    ("validate", "worldviews", "expected_exc", "expected"),
+    [
+        (
+            _validate_worldviews,
+            ["NotAWorldview"],
+            HTTPException,
+            "Unknown worldview 'NotAWorldview'",
+        ),
+        (
+            _validate_worldviews,
+            ["Mathematismus", " "],
+            HTTPException,
+            "worldviews entries must be non-empty",
+        ),
+        (
+            _validate_prompt_files,
+            ["Mathematismus", "Idealismus"],
+            ValueError,
+            "Missing sigrid-von-gleich worldview prompt(s): ",
+        ),
+    ],
+    ids=["unknown-worldview", "blank-worldview", "missing-prompts"],
+)
+def test_translate_to_worldview_validation(
+    sigrid_prompt_tree, monkeypatch, validate, worldviews, expected_exc, expected
+):
+    """Each validator fails fast on its own, with its own exception type and message."""
+    # Mathematismus is complete, Idealismus lacks what/how (see conftest).
+    monkeypatch.setattr(settings, "assistants_root", str(sigrid_prompt_tree))
 
+    with pytest.raises(expected_exc) as exc:
+        validate(worldviews)
+
+    if expected_exc is HTTPException:
+        assert exc.value.status_code == 400
+        assert expected in exc.value.detail
+    else:
+        assert expected in str(exc.value)
+        # Only the incomplete worldview is reported.
+        assert "Idealismus" in str(exc.value)
+        assert "Mathematismus" not in str(exc.value)
+
+
+def test_translate_to_worldview_validation_accepts_complete_worldview(
+    sigrid_prompt_tree, monkeypatch
+):
+    monkeypatch.setattr(settings, "assistants_root", str(sigrid_prompt_tree))
+
+    cleaned = _validate_worldviews([" Mathematismus "])
+    assert cleaned == ["Mathematismus"]
+    _validate_prompt_files(cleaned)